@@ -8,7 +8,9 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import functools
 import json
+import sys
 import uuid
 from dataclasses import dataclass
 from pathlib import Path
@@ -19,9 +21,12 @@ from zoneinfo import ZoneInfo
 import gcal_client
 
 CONFIG_PATH = Path("schedule_config.json")
+# Partial response for the existing-events listing: only what main() prints (plus id/plan tags).
+EXISTING_EVENT_FIELDS = "items(id,summary,start,end,extendedProperties/private),nextPageToken"
 
 
 DayKey = str  # "mon".."sun"
+DAY_KEYS: Tuple[DayKey, ...] = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")  # by date.weekday()
 
 
 def iso_week_start(iso_week: str) -> dt.date:
@@ -32,7 +37,14 @@ def iso_week_start(iso_week: str) -> dt.date:
         raise ValueError("Use ISO week format: YYYY-Www") from exc
 
 
+@functools.lru_cache(maxsize=64)
+def _tz(name: str) -> ZoneInfo:
+    return ZoneInfo(name)
+
+
+@functools.lru_cache(maxsize=256)
 def parse_time(timestr: str) -> dt.time:
+    # Config reuses the same handful of "HH:MM" strings every day; dt.time is immutable.
     hour, minute = timestr.split(":")
     return dt.time(hour=int(hour), minute=int(minute))
 
@@ -41,7 +53,7 @@ def combine(date: dt.date, timestr: str, tz: ZoneInfo) -> dt.datetime:
     return dt.datetime.combine(date, parse_time(timestr), tzinfo=tz)
 
 
-@dataclass
+@dataclass(slots=True)
 class PlannedEvent:
     summary: str
     start: dt.datetime
@@ -69,7 +81,7 @@ def load_config(path: Path) -> dict:
 
 
 def day_name_to_key(day: dt.date) -> DayKey:
-    return ["mon", "tue", "wed", "thu", "fri", "sat", "sun"][day.weekday()]
+    return DAY_KEYS[day.weekday()]
 
 
 def within_window(ev_start: dt.datetime, ev_end: dt.datetime, win_start: dt.datetime, win_end: dt.datetime) -> bool:
@@ -77,30 +89,50 @@ def within_window(ev_start: dt.datetime, ev_end: dt.datetime, win_start: dt.date
 
 
 def list_existing_events(calendar_ids: List[str], start: dt.datetime, end: dt.datetime) -> List[Tuple[dict, str]]:
+    found = gcal_client.list_events_many(
+        calendar_ids,
+        time_min=start,
+        time_max=end,
+        max_results=400,
+        fields=EXISTING_EVENT_FIELDS,
+        all_pages=True,
+    )
     rows: List[Tuple[dict, str]] = []
-    for cal in calendar_ids:
-        events = gcal_client.list_events(calendar_id=cal, time_min=start, time_max=end, max_results=400)
-        for ev in events:
-            rows.append((ev, cal))
+    for cal, events in zip(calendar_ids, found):
+        rows.extend((ev, cal) for ev in events)
     return rows
 
 
 def build_plan(config: dict, week_start: dt.date) -> List[PlannedEvent]:
-    tz = ZoneInfo(config.get("timezone", "UTC"))
+    tz = _tz(config.get("timezone", "UTC"))
     cal_map: Dict[str, str] = config["calendar_map"]
     per_day_overrides: Dict[str, dict] = config.get("overrides", {}).get("per_day", {})
     per_date_overrides: Dict[str, dict] = config.get("overrides", {}).get("per_date", {})
+    default_work_hours: Dict[str, dict] = config.get("work_hours", {})
+    meals: List[dict] = config.get("meals", [])
+
+    # Calendar ids that do not depend on the day.
+    work_cal = cal_map.get("primary", cal_map[next(iter(cal_map))])
+    meal_fallback_cal = cal_map.get("food", cal_map["primary"])
+
+    # One pass over the config instead of re-filtering both lists for each of the 7 days.
+    fixed_by_day: Dict[DayKey, List[dict]] = {}
+    for fixed in config.get("fixed_events", []):
+        fixed_by_day.setdefault(fixed.get("day"), []).append(fixed)
+    hobby_by_day: Dict[DayKey, List[dict]] = {}
+    for hw in config.get("hobby_windows", []):
+        hobby_by_day.setdefault(hw.get("day"), []).append(hw)
 
     plan: List[PlannedEvent] = []
 
     for offset in range(7):
         day_date = week_start + dt.timedelta(days=offset)
-        day_key = day_name_to_key(day_date)
+        day_key = DAY_KEYS[day_date.weekday()]
         day_override = per_day_overrides.get(day_key, {})
         date_override = per_date_overrides.get(day_date.isoformat(), {})
 
         # Work hours
-        work_hours = date_override.get("work_hours", day_override.get("work_hours", config.get("work_hours", {}).get(day_key)))
+        work_hours = date_override.get("work_hours", day_override.get("work_hours", default_work_hours.get(day_key)))
         if work_hours:
             start_dt = combine(day_date, work_hours["start"], tz)
             end_dt = combine(day_date, work_hours["end"], tz)
@@ -110,13 +142,13 @@ def build_plan(config: dict, week_start: dt.date) -> List[PlannedEvent]:
                     start=start_dt,
                     end=end_dt,
                     category="work",
-                    calendar_id=cal_map.get("primary", cal_map[list(cal_map.keys())[0]]),
+                    calendar_id=work_cal,
                     source="plan",
                 )
             )
 
         # Meals
-        for meal in config.get("meals", []):
+        for meal in meals:
             start_dt = combine(day_date, meal["start"], tz)
             end_dt = combine(day_date, meal["end"], tz)
             category = meal.get("category", "food")
@@ -126,15 +158,13 @@ def build_plan(config: dict, week_start: dt.date) -> List[PlannedEvent]:
                     start=start_dt,
                     end=end_dt,
                     category=category,
-                    calendar_id=cal_map.get(category, cal_map.get("food", cal_map["primary"])),
+                    calendar_id=cal_map.get(category, meal_fallback_cal),
                     source="meal",
                 )
             )
 
         # Fixed events
-        for fixed in config.get("fixed_events", []):
-            if fixed.get("day") != day_key:
-                continue
+        for fixed in fixed_by_day.get(day_key, ()):
             start_dt = combine(day_date, fixed["start"], tz)
             end_dt = combine(day_date, fixed["end"], tz)
             category = fixed.get("category", "primary")
@@ -150,9 +180,7 @@ def build_plan(config: dict, week_start: dt.date) -> List[PlannedEvent]:
             )
 
         # Hobby windows
-        for hw in config.get("hobby_windows", []):
-            if hw.get("day") != day_key:
-                continue
+        for hw in hobby_by_day.get(day_key, ()):
             start_dt = combine(day_date, hw["start"], tz)
             end_dt = combine(day_date, hw["end"], tz)
             category = hw.get("category", "hobbies")
@@ -186,7 +214,7 @@ def main() -> None:
         monday = today - dt.timedelta(days=today.weekday())
         week_start = monday + dt.timedelta(days=7)
 
-    tz = ZoneInfo(config.get("timezone", "UTC"))
+    tz = _tz(config.get("timezone", "UTC"))
     window_start = dt.datetime.combine(week_start, dt.time.min, tzinfo=tz)
     window_end = window_start + dt.timedelta(days=7)
 
@@ -194,37 +222,46 @@ def main() -> None:
     plan = build_plan(config, week_start)
 
     # Existing events for awareness
-    cal_ids = list({config["calendar_map"][k] for k in config["calendar_map"]})
+    cal_ids = list(dict.fromkeys(config["calendar_map"].values()))
     existing = list_existing_events(cal_ids, window_start, window_end)
 
+    # Each listing goes out as one write instead of a print() per event.
     print(f"\nExisting events in window: {len(existing)}")
+    lines = []
     for ev, cal in sorted(existing, key=lambda x: x[0].get("start", {}).get("dateTime", "")):
         start = ev.get("start", {}).get("dateTime") or ev.get("start", {}).get("date")
         end = ev.get("end", {}).get("dateTime") or ev.get("end", {}).get("date")
-        print(f"[{cal}] {ev.get('summary')} | {start} -> {end}")
+        lines.append(f"[{cal}] {ev.get('summary')} | {start} -> {end}\n")
+    sys.stdout.write("".join(lines))
 
     print(f"\nPlanned events (dry-run, total {len(plan)}):")
-    for pe in plan:
-        print(f"[{pe.category}] {pe.summary} | {pe.start.isoformat()} -> {pe.end.isoformat()} | cal={pe.calendar_id}")
+    sys.stdout.write(
+        "".join(
+            f"[{pe.category}] {pe.summary} | {pe.start.isoformat()} -> {pe.end.isoformat()} | cal={pe.calendar_id}\n"
+            for pe in plan
+        )
+    )
 
     if not args.push:
         print("\nDry-run only. Use --push to create these events.")
         return
 
     plan_id = f"plan-{week_start.isoformat()}"
-    created = 0
-    for pe in plan:
-        body_ext = {"source": pe.source, "category": pe.category, "plan_id": plan_id}
-        gcal_client.create_event(
-            calendar_id=pe.calendar_id,
-            summary=pe.summary,
-            start=pe.start,
-            end=pe.end,
-            description=pe.description,
-            extended_properties=body_ext,
-        )
-        created += 1
-    print(f"\nPushed {created} events to Google Calendar.")
+    items = [
+        {
+            "calendar_id": pe.calendar_id,
+            "body": gcal_client.event_body(
+                summary=pe.summary,
+                start=pe.start,
+                end=pe.end,
+                description=pe.description,
+                extended_properties={"source": pe.source, "category": pe.category, "plan_id": plan_id},
+            ),
+        }
+        for pe in plan
+    ]
+    created = gcal_client.batch_create(items)
+    print(f"\nPushed {len(created)} events to Google Calendar.")
 
 
 if __name__ == "__main__":
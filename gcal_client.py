@@ -6,30 +6,61 @@ Assumes credentials.json and token.json live in the repo root.
 from __future__ import annotations
 
 import datetime as dt
+import functools
 import pathlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 
+import httplib2
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
 from google.oauth2.credentials import Credentials
 
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
+BATCH_LIMIT = 50  # Calendar API maximum calls per batch request
+LIST_WORKERS = 8  # calendars fetched concurrently by list_events_many
 BASE_PATH = pathlib.Path(__file__).parent
 TOKEN_PATH = BASE_PATH / "token.json"
 CREDS_PATH = BASE_PATH / "credentials.json"
 
+_local = threading.local()
 
+
+@functools.lru_cache(maxsize=1)
 def _load_creds() -> Credentials:
     return Credentials.from_authorized_user_file(str(TOKEN_PATH), SCOPES)
 
 
+@functools.lru_cache(maxsize=1)
 def get_service():
+    """Calendar API client, built once per process (token.json read + client construction)."""
     creds = _load_creds()
-    return build("calendar", "v3", credentials=creds)
+    # Discovery doc ships with the library; skip the file cache and its oauth2client warning.
+    return build("calendar", "v3", credentials=creds, cache_discovery=False)
+
+
+def _http() -> AuthorizedHttp:
+    """
+    Per-thread transport for request.execute(http=...). The service object can be shared,
+    but httplib2.Http is not thread-safe, so each thread gets its own authorised connection.
+    """
+    http = getattr(_local, "http", None)
+    if http is None:
+        http = _local.http = AuthorizedHttp(_load_creds(), http=httplib2.Http())
+    return http
+
+
+def reset_service() -> None:
+    """Forget the cached client, e.g. after token.json was re-issued or a refresh failed."""
+    get_service.cache_clear()
+    _load_creds.cache_clear()
+    _local.__dict__.clear()
 
 
 def list_calendars() -> List[Dict[str, Any]]:
     service = get_service()
-    resp = service.calendarList().list().execute()
+    resp = service.calendarList().list().execute(http=_http())
     return resp.get("items", [])
 
 
@@ -38,7 +69,13 @@ def list_events(
     time_min: Optional[dt.datetime] = None,
     time_max: Optional[dt.datetime] = None,
     max_results: int = 50,
+    fields: Optional[str] = None,
+    all_pages: bool = False,
 ) -> List[Dict[str, Any]]:
+    """
+    fields: partial-response selector, e.g. "items(id,summary,start,end),nextPageToken".
+    all_pages: follow nextPageToken until exhausted; max_results is then the page size.
+    """
     service = get_service()
     params: Dict[str, Any] = {
         "calendarId": calendar_id,
@@ -50,12 +87,41 @@ def list_events(
         params["timeMin"] = time_min.isoformat()
     if time_max:
         params["timeMax"] = time_max.isoformat()
-    resp = service.events().list(**params).execute()
-    return resp.get("items", [])
+    if fields:
+        if all_pages and "nextPageToken" not in fields:
+            fields += ",nextPageToken"
+        params["fields"] = fields
+    resp = service.events().list(**params).execute(http=_http())
+    items = resp.get("items", [])
+    while all_pages and resp.get("nextPageToken"):
+        resp = service.events().list(pageToken=resp["nextPageToken"], **params).execute(http=_http())
+        items.extend(resp.get("items", []))
+    return items
+
+
+def list_events_many(
+    calendar_ids: List[str],
+    time_min: Optional[dt.datetime] = None,
+    time_max: Optional[dt.datetime] = None,
+    max_results: int = 50,
+    fields: Optional[str] = None,
+    all_pages: bool = False,
+) -> List[List[Dict[str, Any]]]:
+    """
+    list_events for each calendar, up to LIST_WORKERS requests in flight together: wall time is
+    the slowest call, not the sum. Returns one item list per calendar, in calendar_ids order.
+    """
+    if not calendar_ids:
+        return []
 
+    def fetch(calendar_id: str) -> List[Dict[str, Any]]:
+        return list_events(calendar_id, time_min, time_max, max_results, fields, all_pages)
 
-def create_event(
-    calendar_id: str,
+    with ThreadPoolExecutor(max_workers=min(LIST_WORKERS, len(calendar_ids))) as pool:
+        return list(pool.map(fetch, calendar_ids))
+
+
+def event_body(
     summary: str,
     start: dt.datetime,
     end: dt.datetime,
@@ -65,7 +131,6 @@ def create_event(
     attendees: Optional[List[str]] = None,
     extended_properties: Optional[Dict[str, str]] = None,
 ) -> Dict[str, Any]:
-    service = get_service()
     body: Dict[str, Any] = {
         "summary": summary,
         "start": {"dateTime": start.isoformat()},
@@ -81,7 +146,50 @@ def create_event(
         body["attendees"] = [{"email": a} for a in attendees]
     if extended_properties:
         body["extendedProperties"] = {"private": extended_properties}
-    return service.events().insert(calendarId=calendar_id, body=body).execute()
+    return body
+
+
+def create_event(
+    calendar_id: str,
+    summary: str,
+    start: dt.datetime,
+    end: dt.datetime,
+    description: Optional[str] = None,
+    location: Optional[str] = None,
+    color_id: Optional[str] = None,
+    attendees: Optional[List[str]] = None,
+    extended_properties: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    service = get_service()
+    body = event_body(summary, start, end, description, location, color_id, attendees, extended_properties)
+    return service.events().insert(calendarId=calendar_id, body=body).execute(http=_http())
+
+
+def batch_create(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Insert many events, BATCH_LIMIT per HTTP request instead of one request each.
+    items are {"calendar_id": ..., "body": event_body(...)}; returns the created events in order.
+    Stops after the first batch containing a failure and raises that item's error.
+    """
+    service = get_service()
+    created: List[Optional[Dict[str, Any]]] = [None] * len(items)
+    errors: List[Exception] = []
+
+    def on_response(request_id: str, response: Dict[str, Any], exception: Optional[Exception]) -> None:
+        if exception is not None:
+            errors.append(exception)
+        else:
+            created[int(request_id)] = response
+
+    for offset in range(0, len(items), BATCH_LIMIT):
+        batch = service.new_batch_http_request(callback=on_response)
+        for idx in range(offset, min(offset + BATCH_LIMIT, len(items))):
+            item = items[idx]
+            batch.add(service.events().insert(calendarId=item["calendar_id"], body=item["body"]), request_id=str(idx))
+        batch.execute(http=_http())
+        if errors:
+            raise errors[0]
+    return created  # type: ignore[return-value]
 
 
 def patch_event(calendar_id: str, event_id: str, **fields: Any) -> Dict[str, Any]:
@@ -90,4 +198,4 @@ def patch_event(calendar_id: str, event_id: str, **fields: Any) -> Dict[str, Any
     Provide start/end as RFC3339 strings or nested dicts per Google spec.
     """
     service = get_service()
-    return service.events().patch(calendarId=calendar_id, eventId=event_id, body=fields).execute()
+    return service.events().patch(calendarId=calendar_id, eventId=event_id, body=fields).execute(http=_http())
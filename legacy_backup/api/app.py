@@ -1,4 +1,8 @@
+import asyncio
+import hmac
+import logging
 import os
+from contextlib import asynccontextmanager, suppress
 from datetime import timezone
 from typing import Optional
 
@@ -7,11 +11,45 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from . import memory_api, planner_api, pantry_api, recipes_api, shopping_api, skills_api, calendar_api, colors_api
 from .database import init_db
+from .responses import OrjsonResponse
 
 API_KEY = os.getenv("API_BEARER_KEY", "replace-me")
+EXPECTED_TOKEN = API_KEY.encode()
+BEARER_PREFIX = "bearer "
+BEARER_PREFIX_LEN = len(BEARER_PREFIX)
 TZ_UTC = timezone.utc
+MEMORY_PURGE_INTERVAL_SEC = int(os.getenv("MEMORY_PURGE_INTERVAL_SEC", "900"))
 
-app = FastAPI(title="Luke Calendar API")
+logger = logging.getLogger(__name__)
+
+
+async def _purge_expired_memory() -> None:
+    while True:
+        try:
+            await memory_api.purge_expired()
+        except Exception:
+            logger.exception("Expired memory purge failed")
+        await asyncio.sleep(MEMORY_PURGE_INTERVAL_SEC)
+
+
+async def boot() -> None:
+    await init_db()
+    await colors_api.ensure_default_colors()
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    await boot()
+    purge_task = asyncio.create_task(_purge_expired_memory())
+    try:
+        yield
+    finally:
+        purge_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await purge_task
+
+
+app = FastAPI(title="Luke Calendar API", lifespan=lifespan, default_response_class=OrjsonResponse)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -20,21 +58,13 @@ app.add_middleware(
 )
 
 
-def require_bearer(authorization: Optional[str] = Header(None)):
-    if not authorization or not authorization.lower().startswith("bearer "):
+async def require_bearer(authorization: Optional[str] = Header(None)):
+    if not authorization or authorization[:BEARER_PREFIX_LEN].lower() != BEARER_PREFIX:
         raise HTTPException(status_code=401, detail="Missing bearer token")
-    token = authorization.split(" ", 1)[1]
-    if token != API_KEY:
+    if not hmac.compare_digest(authorization[BEARER_PREFIX_LEN:].encode(), EXPECTED_TOKEN):
         raise HTTPException(status_code=403, detail="Invalid token")
 
 
-def boot() -> None:
-    init_db()
-    colors_api.ensure_default_colors()
-
-
-boot()
-
 app.include_router(calendar_api.router, dependencies=[Depends(require_bearer)])
 app.include_router(memory_api.router, dependencies=[Depends(require_bearer)])
 app.include_router(planner_api.router, dependencies=[Depends(require_bearer)])
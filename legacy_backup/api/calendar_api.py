@@ -1,15 +1,25 @@
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional
+from typing import Annotated, AsyncIterator, Dict, List, Optional, Tuple
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel, EmailStr
-from sqlmodel import Session, select
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, StringConstraints
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from .database import get_session
-from .models import Event
+from .database import get_session, session_scope
+from .models import Event, EventAttendee
+from .responses import ORJSON_OPTIONS
 
 router = APIRouter()
 TZ_UTC = timezone.utc
+LIST_BATCH_ROWS = 500  # rows fetched and encoded per chunk when streaming /events.list
+# Attendee addresses: a shape check, not full RFC 5322 validation.
+EMAIL_PATTERN = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+Email = Annotated[str, StringConstraints(pattern=EMAIL_PATTERN)]
 
 
 class BusyBlock(BaseModel):
@@ -30,7 +40,7 @@ class EventCreate(BaseModel):
     start: datetime
     end: datetime
     location: Optional[str] = None
-    attendees: Optional[List[EmailStr]] = None
+    attendees: Optional[List[Email]] = None
     description: Optional[str] = None
     idempotency_key: Optional[str] = None
     category: Optional[str] = None
@@ -44,7 +54,7 @@ class EventUpdate(BaseModel):
     start: Optional[datetime] = None
     end: Optional[datetime] = None
     location: Optional[str] = None
-    attendees: Optional[List[EmailStr]] = None
+    attendees: Optional[List[Email]] = None
     description: Optional[str] = None
     category: Optional[str] = None
     color: Optional[str] = None
@@ -57,102 +67,163 @@ class EventOut(BaseModel):
     start: datetime
     end: datetime
     location: Optional[str]
-    attendees: List[EmailStr]
+    attendees: List[str]
     description: Optional[str]
     category: Optional[str]
     color: Optional[str]
     meta: Optional[Dict[str, object]]
 
-    @classmethod
-    def from_model(cls, event: Event) -> "EventOut":
-        attendees = event.attendees_csv.split(",") if event.attendees_csv else []
-        return cls(
-            id=event.id,
-            title=event.title,
-            start=event.start,
-            end=event.end,
-            location=event.location,
-            attendees=[EmailStr(a) for a in attendees if a],
-            description=event.description,
-            category=event.category,
-            color=event.color,
-            meta=event.meta_json,
-        )
 
+# Columns behind each /events.list item; rows are packed straight into dicts (no ORM objects).
+EVENT_OUT_COLUMNS = (
+    Event.id,
+    Event.title,
+    Event.start,
+    Event.end,
+    Event.location,
+    Event.description,
+    Event.category,
+    Event.color,
+    Event.meta_json,
+)
 
-def _overlap(a_start: datetime, a_end: datetime, b_start: datetime, b_end: datetime) -> bool:
-    return max(a_start, b_start) < min(a_end, b_end)
 
+def _event_out(row, attendees: Dict[str, List[str]]) -> Dict[str, object]:
+    return {
+        "id": row.id,
+        "title": row.title,
+        "start": row.start,
+        "end": row.end,
+        "location": row.location,
+        "attendees": attendees.get(row.id, []),
+        "description": row.description,
+        "category": row.category,
+        "color": row.color,
+        "meta": row.meta_json,
+    }
 
-def _list_busy(session: Session, start: datetime, end: datetime) -> List[BusyBlock]:
-    q = select(Event).where(Event.start < end, Event.end > start)
-    rows = session.exec(q).all()
-    return [BusyBlock(start=e.start, end=e.end) for e in rows]
 
+def _attendee_rows(event_id: str, emails: List[str]) -> List[EventAttendee]:
+    return [EventAttendee(event_id=event_id, email=email) for email in dict.fromkeys(emails)]
 
-def _round_up(dt: datetime, minutes: int) -> datetime:
-    discard = timedelta(minutes=dt.minute % minutes, seconds=dt.second, microseconds=dt.microsecond)
-    if discard == timedelta(0):
-        return dt.replace(second=0, microsecond=0)
-    return (dt - discard + timedelta(minutes=minutes)).replace(second=0, microsecond=0)
+
+async def _attendees_by_event(session: AsyncSession, event_ids: List[str]) -> Dict[str, List[str]]:
+    by_event: Dict[str, List[str]] = {}
+    q = select(EventAttendee.event_id, EventAttendee.email).where(EventAttendee.event_id.in_(event_ids))
+    for event_id, email in await session.exec(q):
+        by_event.setdefault(event_id, []).append(email)
+    return by_event
+
+
+async def _stream_events(query) -> AsyncIterator[bytes]:
+    """Yield the query's events as one JSON array, LIST_BATCH_ROWS rows at a time.
+
+    Attendees are fetched with one IN query per batch. Owns its session: the
+    request-scoped one is closed before the body is streamed.
+    """
+    async with session_scope() as session:
+        result = await session.stream(query.execution_options(yield_per=LIST_BATCH_ROWS))
+        yield b"["
+        sep = b""
+        async for batch in result.partitions():
+            attendees = await _attendees_by_event(session, [row.id for row in batch])
+            yield sep + b",".join(orjson.dumps(_event_out(row, attendees), option=ORJSON_OPTIONS) for row in batch)
+            sep = b","
+        yield b"]"
+
+
+async def _list_busy(session: AsyncSession, start: datetime, end: datetime) -> List[BusyBlock]:
+    # start/end only, so ix_event_start_end covers the query and no table rows are read.
+    q = select(Event.start, Event.end).where(Event.start < end, Event.end > start)
+    return [BusyBlock(start=s, end=e) for s, e in await session.exec(q)]
+
+
+async def _has_conflict(session: AsyncSession, start: datetime, end: datetime, exclude_id: Optional[str] = None) -> bool:
+    q = select(Event.id).where(Event.start < end, Event.end > start)
+    if exclude_id:
+        q = q.where(Event.id != exclude_id)
+    return (await session.exec(q.limit(1))).first() is not None
+
+
+# find_slots works on integer UTC epoch microseconds: its loop then compares and adds plain ints
+# instead of allocating a datetime/timedelta per step.
+EPOCH = datetime(1970, 1, 1, tzinfo=TZ_UTC)
+ONE_US = timedelta(microseconds=1)
+US_PER_MIN = 60_000_000
+
+
+def _to_us(dt: datetime) -> int:
+    return (dt - EPOCH) // ONE_US
+
+
+def _from_us(us: int) -> datetime:
+    return EPOCH + timedelta(microseconds=us)
+
+
+def _round_up_us(t: int, minutes: int) -> int:
+    """Round up to the next multiple of ``minutes`` past the hour (seconds dropped)."""
+    discard = (t // US_PER_MIN) % 60 % minutes * US_PER_MIN + t % US_PER_MIN
+    return t if discard == 0 else t - discard + minutes * US_PER_MIN
 
 
 @router.get("/availability.freebusy", response_model=FreeBusyResponse)
-def freebusy(
+async def freebusy(
     start: datetime = Query(...),
     end: datetime = Query(...),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     if start.tzinfo is None or end.tzinfo is None:
         raise HTTPException(400, "Use ISO 8601 with timezone (UTC preferred)")
-    return FreeBusyResponse(busy=_list_busy(session, start.astimezone(TZ_UTC), end.astimezone(TZ_UTC)))
+    return FreeBusyResponse(busy=await _list_busy(session, start.astimezone(TZ_UTC), end.astimezone(TZ_UTC)))
 
 
 @router.get("/availability.find_slots", response_model=SlotsResponse)
-def find_slots(
+async def find_slots(
     duration_min: int = Query(..., ge=5),
     window_start: datetime = Query(...),
     window_end: datetime = Query(...),
     round_to_min: int = Query(30, ge=5),
     buffer_min: int = Query(5, ge=0),
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
 ):
     if window_start.tzinfo is None or window_end.tzinfo is None:
         raise HTTPException(400, "Use ISO 8601 with timezone")
     ws = window_start.astimezone(TZ_UTC)
     we = window_end.astimezone(TZ_UTC)
-    dur = timedelta(minutes=duration_min)
-    buffer_td = timedelta(minutes=buffer_min)
-
-    busy = sorted(_list_busy(session, ws, we), key=lambda b: b.start)
-    t = _round_up(ws, round_to_min)
-    slots: List[BusyBlock] = []
+    dur = duration_min * US_PER_MIN
+    buf = buffer_min * US_PER_MIN
 
-    while t + dur <= we:
-        candidate_start = t
+    rows = await session.exec(
+        select(Event.start, Event.end).where(Event.start < we, Event.end > ws).order_by(Event.start)
+    )
+    busy = [(_to_us(start) - buf, _to_us(end) + buf) for start, end in rows]  # buffered
+    n_busy = len(busy)
+    window_end_us = _to_us(we)
+    t = _round_up_us(_to_us(ws), round_to_min)
+    slots: List[Tuple[int, int]] = []
+
+    # t only moves forward, so a block that (with buffer) ends by t can never block again;
+    # i tracks the earliest-starting block still live, and it is the only one worth testing.
+    i = 0
+    while t + dur <= window_end_us:
         candidate_end = t + dur
-        blocked = False
-        for b in busy:
-            b_start = b.start - buffer_td
-            b_end = b.end + buffer_td
-            if _overlap(candidate_start, candidate_end, b_start, b_end):
-                blocked = True
-                t = max(t, b.end + buffer_td)
-                t = _round_up(t, round_to_min)
-                break
-        if not blocked:
-            slots.append(BusyBlock(start=candidate_start, end=candidate_end))
-            t = _round_up(candidate_end + buffer_td, round_to_min)
-    return SlotsResponse(slots=slots)
+        while i < n_busy and busy[i][1] <= t:
+            i += 1
+        if i < n_busy and busy[i][0] < candidate_end:
+            t = _round_up_us(busy[i][1], round_to_min)
+            i += 1
+            continue
+        slots.append((t, candidate_end))
+        t = _round_up_us(candidate_end + buf, round_to_min)
+    return SlotsResponse(slots=[BusyBlock(start=_from_us(s), end=_from_us(e)) for s, e in slots])
 
 
 @router.get("/events.list", response_model=List[EventOut])
-def events_list(
+async def events_list(
     start: Optional[datetime] = Query(None),
     end: Optional[datetime] = Query(None),
-    session: Session = Depends(get_session),
 ):
-    query = select(Event)
+    query = select(*EVENT_OUT_COLUMNS)
     if start:
         if start.tzinfo is None:
             raise HTTPException(400, "Start must include timezone")
@@ -162,28 +233,29 @@ def events_list(
             raise HTTPException(400, "End must include timezone")
         query = query.where(Event.start <= end.astimezone(TZ_UTC))
     query = query.order_by(Event.start)
-    events = session.exec(query).all()
-    return [EventOut.from_model(e) for e in events]
+    # Streamed as-is (each item matches EventOut); response_model stays for the OpenAPI schema.
+    return StreamingResponse(_stream_events(query), media_type="application/json")
+
+
+async def _event_id_for_key(session: AsyncSession, idempotency_key: str) -> Optional[str]:
+    return (await session.exec(select(Event.id).where(Event.idempotency_key == idempotency_key))).first()
 
 
 @router.post("/events.create")
-def events_create(payload: EventCreate, session: Session = Depends(get_session)):
+async def events_create(payload: EventCreate, session: AsyncSession = Depends(get_session)):
     if payload.idempotency_key:
-        existing = session.exec(select(Event).where(Event.idempotency_key == payload.idempotency_key)).first()
-        if existing:
-            return {"id": existing.id, "htmlLink": f"https://calendar.local/event/{existing.id}"}
+        existing_id = await _event_id_for_key(session, payload.idempotency_key)
+        if existing_id:
+            return {"id": existing_id, "htmlLink": f"https://calendar.local/event/{existing_id}"}
 
-    busy = _list_busy(session, payload.start.astimezone(TZ_UTC), payload.end.astimezone(TZ_UTC))
-    for b in busy:
-        if _overlap(payload.start, payload.end, b.start, b.end):
-            raise HTTPException(409, "Time conflict – choose another slot")
+    if await _has_conflict(session, payload.start.astimezone(TZ_UTC), payload.end.astimezone(TZ_UTC)):
+        raise HTTPException(409, "Time conflict – choose another slot")
 
     ev = Event(
         title=payload.title,
         start=payload.start.astimezone(TZ_UTC),
         end=payload.end.astimezone(TZ_UTC),
         location=payload.location,
-        attendees_csv=",".join(payload.attendees) if payload.attendees else None,
         description=payload.description,
         idempotency_key=payload.idempotency_key,
         category=payload.category,
@@ -191,35 +263,42 @@ def events_create(payload: EventCreate, session: Session = Depends(get_session))
         meta_json=payload.meta,
     )
     session.add(ev)
-    session.commit()
+    if payload.attendees:
+        session.add_all(_attendee_rows(ev.id, payload.attendees))
+    try:
+        await session.commit()
+    except IntegrityError:
+        # A concurrent request with the same idempotency key committed first: answer with its event.
+        await session.rollback()
+        existing_id = await _event_id_for_key(session, payload.idempotency_key) if payload.idempotency_key else None
+        if not existing_id:
+            raise
+        return {"id": existing_id, "htmlLink": f"https://calendar.local/event/{existing_id}"}
     return {"id": ev.id, "htmlLink": f"https://calendar.local/event/{ev.id}"}
 
 
 @router.post("/events.update")
-def events_update(payload: EventUpdate, session: Session = Depends(get_session)):
-    ev = session.get(Event, payload.id)
+async def events_update(payload: EventUpdate, session: AsyncSession = Depends(get_session)):
+    ev = await session.get(Event, payload.id)
     if not ev:
         raise HTTPException(404, "Not found")
 
     new_start = payload.start.astimezone(TZ_UTC) if payload.start else ev.start
     new_end = payload.end.astimezone(TZ_UTC) if payload.end else ev.end
-    busy = _list_busy(session, new_start, new_end)
-    for b in busy:
-        if b.start == ev.start and b.end == ev.end:
-            continue
-        if _overlap(new_start, new_end, b.start, b.end):
-            raise HTTPException(409, "Time conflict – choose another slot")
+    if await _has_conflict(session, new_start, new_end, exclude_id=ev.id):
+        raise HTTPException(409, "Time conflict – choose another slot")
 
     ev.title = payload.title or ev.title
     ev.start = new_start
     ev.end = new_end
     ev.location = payload.location or ev.location
     if payload.attendees is not None:
-        ev.attendees_csv = ",".join(payload.attendees)
+        await session.exec(delete(EventAttendee).where(EventAttendee.event_id == ev.id))
+        session.add_all(_attendee_rows(ev.id, payload.attendees))
     ev.description = payload.description or ev.description
     ev.category = payload.category or ev.category
     ev.color = payload.color or ev.color
     ev.meta_json = payload.meta if payload.meta is not None else ev.meta_json
     session.add(ev)
-    session.commit()
+    await session.commit()
     return {"id": ev.id, "htmlLink": f"https://calendar.local/event/{ev.id}"}
@@ -1,8 +1,9 @@
-from typing import Dict
+import time
+from typing import Dict, Optional, Tuple
 
 from fastapi import APIRouter, Depends
 from pydantic import BaseModel
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from .database import get_session
 from .models import Memory
@@ -22,6 +23,16 @@ DEFAULT_COLORS = {
 }
 
 MEMORY_KEY = "colors:map"
+COLORS_CACHE_TTL_SEC = 300.0
+
+# (expires_at, colors). The record only changes through colors.map or memory.* writes,
+# which drop the cache; the TTL bounds staleness for anything else touching the table.
+_colors_cache: Optional[Tuple[float, Dict[str, str]]] = None
+
+
+def invalidate_colors_cache() -> None:
+    global _colors_cache
+    _colors_cache = None
 
 
 class ColorMapResponse(BaseModel):
@@ -32,41 +43,43 @@ class ColorMapUpdate(BaseModel):
     colors: Dict[str, str]
 
 
-def ensure_default_colors(session: Session | None = None) -> None:
-    close_session = False
+async def ensure_default_colors(session: AsyncSession | None = None) -> None:
     if session is None:
         from .database import session_scope
 
-        close_session = True
-        ctx = session_scope()
-        session = ctx.__enter__()
-    try:
-        record = session.get(Memory, MEMORY_KEY)
-        if not record:
-            record = Memory(key=MEMORY_KEY, value_json={"colors": DEFAULT_COLORS})
-            session.add(record)
-            session.commit()
-    finally:
-        if close_session:
-            ctx.__exit__(None, None, None)
+        async with session_scope() as scoped:
+            await ensure_default_colors(scoped)
+        return
+    record = await session.get(Memory, MEMORY_KEY)
+    if not record:
+        record = Memory(key=MEMORY_KEY, value_json={"colors": DEFAULT_COLORS})
+        session.add(record)
+        await session.commit()
 
 
 @router.get("/colors.map", response_model=ColorMapResponse)
-def colors_map(session: Session = Depends(get_session)):
-    record = session.get(Memory, MEMORY_KEY)
+async def colors_map(session: AsyncSession = Depends(get_session)):
+    global _colors_cache
+    now = time.monotonic()
+    if _colors_cache is not None and _colors_cache[0] > now:
+        return ColorMapResponse(colors=_colors_cache[1])
+    record = await session.get(Memory, MEMORY_KEY)
     if not record:
-        ensure_default_colors(session)
-        record = session.get(Memory, MEMORY_KEY)
-    return ColorMapResponse(colors=record.value_json.get("colors", DEFAULT_COLORS))
+        await ensure_default_colors(session)
+        record = await session.get(Memory, MEMORY_KEY)
+    colors = record.value_json.get("colors", DEFAULT_COLORS)
+    _colors_cache = (now + COLORS_CACHE_TTL_SEC, colors)
+    return ColorMapResponse(colors=colors)
 
 
 @router.post("/colors.map", response_model=ColorMapResponse)
-def colors_update(payload: ColorMapUpdate, session: Session = Depends(get_session)):
-    record = session.get(Memory, MEMORY_KEY)
+async def colors_update(payload: ColorMapUpdate, session: AsyncSession = Depends(get_session)):
+    record = await session.get(Memory, MEMORY_KEY)
     if not record:
         record = Memory(key=MEMORY_KEY, value_json={"colors": payload.colors})
     else:
         record.value_json = {"colors": payload.colors}
     session.add(record)
-    session.commit()
+    await session.commit()
+    invalidate_colors_cache()
     return ColorMapResponse(colors=record.value_json["colors"])
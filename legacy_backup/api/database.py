@@ -1,24 +1,215 @@
+import logging
 import os
-from contextlib import contextmanager
-from typing import Iterator
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List
 
-from sqlmodel import Session, SQLModel, create_engine
+import orjson
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+logger = logging.getLogger(__name__)
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///calendar.db")
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {})
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+# Per-process connection pool.
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+POOL_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+# Only SQLite is served: memory_set merges with JSON1 json_set and the upserts use SQLite's ON CONFLICT.
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite"}
+# Indexes the models no longer declare; create_all never removes them from an existing database.
+RETIRED_INDEXES = ("ix_memory_ttl_expires_at",)
+
+
+def json_dumps(value: Any) -> str:
+    """orjson encoder for JSON columns; non-str keys are stringified like the stdlib does."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _async_url(url: str):
+    """Swap a plain sync driver for its asyncio counterpart; explicit drivers are kept."""
+    parsed = make_url(url)
+    return parsed.set(drivername=ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername))
+
+
+def _is_memory_db(url: str) -> bool:
+    return url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in url
+
+
+if IS_SQLITE and _is_memory_db(DATABASE_URL):
+    # One connection, otherwise every checkout sees its own empty database. A queue of one (not
+    # StaticPool) hands it to a single session at a time, so concurrent sessions cannot interleave
+    # statements in, or roll back, each other's transaction.
+    engine = create_async_engine(
+        _async_url(DATABASE_URL),
+        connect_args={"check_same_thread": False},
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        json_serializer=json_dumps,
+        json_deserializer=orjson.loads,
+    )
+else:
+    engine = create_async_engine(
+        _async_url(DATABASE_URL),
+        connect_args={"check_same_thread": False} if IS_SQLITE else {},
+        pool_size=POOL_SIZE,
+        max_overflow=POOL_MAX_OVERFLOW,
+        pool_timeout=30,
+        # A local SQLite file never drops idle connections, so only pay for liveness checks on a server.
+        pool_pre_ping=not IS_SQLITE,
+        pool_recycle=-1 if IS_SQLITE else 1800,
+        json_serializer=json_dumps,
+        json_deserializer=orjson.loads,
+    )
+
+if IS_SQLITE:
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def _migrate_attendees_csv(connection) -> None:
+    """Move legacy ``event.attendees_csv`` values into ``eventattendee``, once.
+
+    Migrated rows are nulled out, so later boots find nothing left to copy.
+    """
+    if "attendees_csv" not in {c["name"] for c in inspect(connection).get_columns("event")}:
+        return
+    legacy = connection.execute(
+        text("SELECT id, attendees_csv FROM event WHERE attendees_csv IS NOT NULL AND attendees_csv != ''")
+    ).all()
+    rows = [
+        {"event_id": event_id, "email": email}
+        for event_id, csv in legacy
+        for email in dict.fromkeys(a for a in csv.split(",") if a)
+    ]
+    if rows:
+        connection.execute(
+            text("INSERT OR IGNORE INTO eventattendee (event_id, email) VALUES (:event_id, :email)"), rows
+        )
+    connection.execute(text("UPDATE event SET attendees_csv = NULL WHERE attendees_csv IS NOT NULL"))
+
+
+def _drop_stale_indexes(connection) -> None:
+    """Drop retired indexes, and those whose uniqueness no longer matches the model so they get rebuilt.
+
+    Reads PRAGMA index_list rather than reflecting: reflection skips expression indexes.
+    """
+    for name in RETIRED_INDEXES:
+        connection.exec_driver_sql(f'DROP INDEX IF EXISTS "{name}"')
+    for table in SQLModel.metadata.sorted_tables:
+        wanted = {index.name: bool(index.unique) for index in table.indexes}
+        for _seq, name, unique, *_rest in connection.exec_driver_sql(f'PRAGMA index_list("{table.name}")'):
+            if name in wanted and bool(unique) != wanted[name]:
+                connection.exec_driver_sql(f'DROP INDEX "{name}"')
+
+
+def _dedupe_idempotency_keys(connection) -> None:
+    """Clear repeated idempotency keys so the unique index can be built; no event is deleted.
+
+    Before the index was unique, two racing retries could both insert. The first-inserted
+    event (lowest rowid) keeps the key; the others only lose it.
+    """
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'ix_event_idempotency_key'"
+    ).first()
+    if exists:
+        return
+    repeats = connection.exec_driver_sql(
+        "SELECT id, idempotency_key FROM event WHERE idempotency_key IS NOT NULL AND rowid NOT IN "
+        "(SELECT min(rowid) FROM event WHERE idempotency_key IS NOT NULL GROUP BY idempotency_key)"
+    ).all()
+    for event_id, key in repeats:
+        logger.warning("Clearing repeated idempotency_key %r from event %s", key, event_id)
+    if repeats:
+        connection.execute(
+            text("UPDATE event SET idempotency_key = NULL WHERE id = :id"), [{"id": row[0]} for row in repeats]
+        )
+
+
+def _dedupe_pantry_names(connection) -> None:
+    """Fold rows sharing a lower(name) into one so the unique name index can be built.
+
+    The most recently updated row survives. Quantities in the survivor's unit are added to it;
+    every removed row is logged, so stock in another unit can still be re-entered by hand.
+    """
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'ix_pantryitem_lower_name'"
+    ).first()
+    if exists:
+        return
+    rows = connection.exec_driver_sql(
+        "SELECT lower(name) AS folded, id, name, quantity, unit FROM pantryitem WHERE lower(name) IN "
+        "(SELECT lower(name) FROM pantryitem GROUP BY lower(name) HAVING count(*) > 1) "
+        "ORDER BY lower(name), updated_at DESC, rowid DESC"
+    ).all()
+    groups: Dict[str, List[Any]] = {}
+    for row in rows:
+        groups.setdefault(row.folded, []).append(row)
+    for survivor, *removed in groups.values():
+        quantity = survivor.quantity + sum(row.quantity for row in removed if row.unit == survivor.unit)
+        for row in removed:
+            logger.warning(
+                "Merging duplicate pantry item %s (%r, %s %s) into %s",
+                row.id, row.name, row.quantity, row.unit or "", survivor.id,
+            )
+        connection.execute(
+            text("DELETE FROM pantryitem WHERE id = :id"), [{"id": row.id} for row in removed]
+        )
+        connection.execute(
+            text("UPDATE pantryitem SET quantity = :quantity WHERE id = :id"),
+            {"quantity": quantity, "id": survivor.id},
+        )
+
+
+def _create_schema(connection) -> None:
+    if IS_SQLITE:
+        _drop_stale_indexes(connection)
+    SQLModel.metadata.create_all(connection)
+    if IS_SQLITE:
+        _migrate_attendees_csv(connection)
+        _dedupe_idempotency_keys(connection)
+        _dedupe_pantry_names(connection)
+    # create_all skips tables that already exist, so pick up indexes added since. IF NOT EXISTS
+    # rather than checkfirst, which cannot see expression indexes and would try to recreate them.
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            connection.execute(CreateIndex(index, if_not_exists=True))
+
+
+async def init_db() -> None:
+    async with engine.begin() as connection:
+        await connection.run_sync(_create_schema)
 
 
-def init_db() -> None:
-    SQLModel.metadata.create_all(engine)
+# Built once so each request only pays for the session object, not for re-resolving its options.
+# Attributes must stay loaded after commit: lazy refreshes cannot run implicitly under asyncio.
+SessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
-@contextmanager
-def session_scope() -> Iterator[Session]:
-    with Session(engine) as session:
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[AsyncSession]:
+    async with SessionLocal() as session:
         yield session
 
 
-def get_session() -> Iterator[Session]:
-    with Session(engine) as session:
+async def get_session() -> AsyncIterator[AsyncSession]:
+    async with SessionLocal() as session:
         yield session
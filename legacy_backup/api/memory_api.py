@@ -3,9 +3,13 @@ from typing import Any, Dict, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from sqlmodel import Session, select
+from sqlalchemy import case, delete, func, or_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from .database import get_session
+from .colors_api import MEMORY_KEY as COLORS_KEY, invalidate_colors_cache
+from .database import get_session, json_dumps, session_scope
 from .models import Memory
 
 router = APIRouter()
@@ -24,8 +28,8 @@ class MemoryDeletePayload(BaseModel):
     key: str
 
 
-def _is_active(record: Memory) -> bool:
-    now = datetime.now(tz=TZ_UTC)
+def _is_active_at(record: Memory, now: datetime) -> bool:
+    """Python-side validity check for single-row reads; memory.list filters in SQL instead."""
     if record.ttl_expires_at and record.ttl_expires_at <= now:
         return False
     if record.valid_from and record.valid_from > now:
@@ -35,6 +39,19 @@ def _is_active(record: Memory) -> bool:
     return True
 
 
+async def purge_expired() -> int:
+    """Delete rows whose TTL has passed; returns the number of rows removed."""
+    async with session_scope() as session:
+        result = await session.exec(
+            delete(Memory).where(
+                Memory.ttl_expires_at.is_not(None),
+                Memory.ttl_expires_at <= datetime.now(tz=TZ_UTC),
+            )
+        )
+        await session.commit()
+        return result.rowcount
+
+
 def _serialize(record: Memory) -> Dict[str, Any]:
     return {
         "key": record.key,
@@ -47,62 +64,93 @@ def _serialize(record: Memory) -> Dict[str, Any]:
 
 
 @router.get("/memory.get")
-def memory_get(key: str, session: Session = Depends(get_session)):
-    record = session.get(Memory, key)
-    if not record or not _is_active(record):
+async def memory_get(key: str, session: AsyncSession = Depends(get_session)):
+    record = await session.get(Memory, key)
+    if not record or not _is_active_at(record, datetime.now(tz=TZ_UTC)):
         raise HTTPException(404, "Not found")
     return _serialize(record)
 
 
 @router.get("/memory.list")
-def memory_list(prefix: Optional[str] = None, session: Session = Depends(get_session)):
-    query = select(Memory)
+async def memory_list(prefix: Optional[str] = None, session: AsyncSession = Depends(get_session)):
+    now = datetime.now(tz=TZ_UTC)
+    query = select(Memory).where(
+        or_(Memory.ttl_expires_at.is_(None), Memory.ttl_expires_at > now),
+        or_(Memory.valid_from.is_(None), Memory.valid_from <= now),
+        or_(Memory.valid_to.is_(None), Memory.valid_to >= now),
+    )
     if prefix:
         query = query.where(Memory.key.like(f"{prefix}%"))
-    records = [r for r in session.exec(query).all() if _is_active(r)]
-    return [_serialize(r) for r in records]
+    return [_serialize(r) for r in (await session.exec(query)).all()]
+
+
+def _json_path_safe(key: str) -> bool:
+    # JSON1 matches a quoted path label against the key's escaped JSON text, so keys that need
+    # escaping (a quote, a backslash, control characters) cannot be addressed by a $."key" path.
+    return json_dumps(key)[1:-1] == key
+
+
+def _merge_value_expr(value: Dict[str, Any]):
+    """Shallow-merge ``value`` into the stored JSON object inside SQLite (JSON1)."""
+    args = []
+    for key, item in value.items():
+        args.extend((f'$."{key}"', func.json(json_dumps(item))))
+    merged = func.json_set(Memory.value_json, *args) if args else Memory.value_json
+    return case(
+        (func.json_type(Memory.value_json) == "object", merged),
+        else_=func.json(json_dumps(value)),
+    )
 
 
 @router.post("/memory.set")
-def memory_set(payload: MemorySetPayload, session: Session = Depends(get_session)):
+async def memory_set(payload: MemorySetPayload, session: AsyncSession = Depends(get_session)):
     now = datetime.now(tz=TZ_UTC)
-    record = session.get(Memory, payload.key)
     ttl_expires_at = None
     if payload.ttl_min is not None:
         if payload.ttl_min <= 0:
             raise HTTPException(400, "ttl_min must be > 0")
         ttl_expires_at = now + timedelta(minutes=payload.ttl_min)
-    if record:
-        current_value = record.value_json or {}
-        if not isinstance(current_value, dict) or not isinstance(payload.value, dict):
-            record.value_json = payload.value
-        else:
-            merged = {**current_value, **payload.value}
-            record.value_json = merged
-        record.valid_from = payload.valid_from or record.valid_from
-        record.valid_to = payload.valid_to or record.valid_to
-        record.ttl_expires_at = ttl_expires_at or record.ttl_expires_at
-        record.updated_at = now
-        session.add(record)
+    stmt = sqlite_insert(Memory).values(
+        key=payload.key,
+        value_json=payload.value,
+        valid_from=payload.valid_from,
+        valid_to=payload.valid_to,
+        ttl_expires_at=ttl_expires_at,
+        updated_at=now,
+    )
+    if all(_json_path_safe(key) for key in payload.value):
+        merged_value = _merge_value_expr(payload.value)
     else:
-        record = Memory(
-            key=payload.key,
-            value_json=payload.value,
-            valid_from=payload.valid_from,
-            valid_to=payload.valid_to,
-            ttl_expires_at=ttl_expires_at,
-            updated_at=now,
-        )
-        session.add(record)
-    session.commit()
+        # Rare keys JSON1 cannot address: merge in Python within this transaction instead.
+        existing = await session.get(Memory, payload.key)
+        current = existing.value_json if existing and isinstance(existing.value_json, dict) else {}
+        merged_value = {**current, **payload.value}
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Memory.key],
+        set_={
+            "value_json": merged_value,
+            "valid_from": func.coalesce(stmt.excluded.valid_from, Memory.valid_from),
+            "valid_to": func.coalesce(stmt.excluded.valid_to, Memory.valid_to),
+            "ttl_expires_at": func.coalesce(stmt.excluded.ttl_expires_at, Memory.ttl_expires_at),
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    record = (
+        await session.exec(stmt.returning(Memory), execution_options={"populate_existing": True})
+    ).scalar_one()
+    await session.commit()
+    if payload.key == COLORS_KEY:
+        invalidate_colors_cache()
     return _serialize(record)
 
 
 @router.post("/memory.delete")
-def memory_delete(payload: MemoryDeletePayload, session: Session = Depends(get_session)):
-    record = session.get(Memory, payload.key)
+async def memory_delete(payload: MemoryDeletePayload, session: AsyncSession = Depends(get_session)):
+    record = await session.get(Memory, payload.key)
     if not record:
         raise HTTPException(404, "Not found")
-    session.delete(record)
-    session.commit()
+    await session.delete(record)
+    await session.commit()
+    if payload.key == COLORS_KEY:
+        invalidate_colors_cache()
     return {"status": "deleted"}
@@ -1,27 +1,42 @@
-import uuid
 from datetime import date, datetime, timezone
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import Column, JSON
+from sqlalchemy import Column, Index, JSON, delete, event, func, text
 from sqlmodel import Field, SQLModel
+from ulid import ULID
 
 
-def _uuid() -> str:
-    return str(uuid.uuid4())
+def new_id() -> str:
+    # ULIDs sort by creation time, so new rows append to the end of the primary key index.
+    return str(ULID())
 
 
 class Event(SQLModel, table=True):
-    id: str = Field(default_factory=_uuid, primary_key=True)
+    __table_args__ = (Index("ix_event_start_end", "start", "end"),)
+
+    id: str = Field(default_factory=new_id, primary_key=True)
     title: str
     start: datetime
     end: datetime
     location: Optional[str] = None
-    attendees_csv: Optional[str] = None
     description: Optional[str] = None
     category: Optional[str] = Field(default=None, index=True)
     color: Optional[str] = None
     meta_json: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON))
-    idempotency_key: Optional[str] = Field(default=None, index=True, unique=False)
+    # Unique: lookups are single index seeks, and a retried push cannot insert the event twice.
+    idempotency_key: Optional[str] = Field(default=None, index=True, unique=True)
+
+
+class EventAttendee(SQLModel, table=True):
+    # One row per (event, address): no CSV to split per read, and attendee lookups hit an index.
+    event_id: str = Field(foreign_key="event.id", primary_key=True)
+    email: str = Field(primary_key=True, index=True)
+
+
+@event.listens_for(Event, "after_delete")
+def _delete_event_attendees(_mapper, connection, target: Event) -> None:
+    # SQLite leaves foreign keys unenforced here, so ON DELETE CASCADE cannot be relied on.
+    connection.execute(delete(EventAttendee).where(EventAttendee.event_id == target.id))
 
 
 def _utcnow() -> datetime:
@@ -29,27 +44,31 @@ def _utcnow() -> datetime:
 
 
 class Memory(SQLModel, table=True):
+    # Leads with the purge's filter column; key lookups and prefix scans already use the primary key.
+    __table_args__ = (Index("ix_memory_ttl", "ttl_expires_at", sqlite_where=text("ttl_expires_at IS NOT NULL")),)
+
     key: str = Field(primary_key=True)
     value_json: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON))
     valid_from: Optional[datetime] = None
     valid_to: Optional[datetime] = None
-    ttl_expires_at: Optional[datetime] = Field(default=None, index=True)
+    ttl_expires_at: Optional[datetime] = None
     updated_at: datetime = Field(default_factory=_utcnow, index=True)
 
 
 class Recipe(SQLModel, table=True):
-    id: str = Field(default_factory=_uuid, primary_key=True)
+    id: str = Field(default_factory=new_id, primary_key=True)
     name: str
     description: Optional[str] = None
     instructions: Optional[str] = None
     ingredients_json: List[Dict[str, Any]] = Field(default_factory=list, sa_column=Column(JSON))
     tags: List[str] = Field(default_factory=list, sa_column=Column(JSON))
     created_at: datetime = Field(default_factory=_utcnow)
-    updated_at: datetime = Field(default_factory=_utcnow)
+    # Indexed for recipes_api's cache version probe, max(updated_at).
+    updated_at: datetime = Field(default_factory=_utcnow, index=True)
 
 
 class PlanWeek(SQLModel, table=True):
-    id: str = Field(default_factory=_uuid, primary_key=True)
+    id: str = Field(default_factory=new_id, primary_key=True)
     week_start: date
     week_end: date
     request_json: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON))
@@ -60,7 +79,7 @@ class PlanWeek(SQLModel, table=True):
 
 
 class ShoppingList(SQLModel, table=True):
-    id: str = Field(default_factory=_uuid, primary_key=True)
+    id: str = Field(default_factory=new_id, primary_key=True)
     plan_id: Optional[str] = Field(default=None, foreign_key="planweek.id")
     recipe_ids: List[str] = Field(default_factory=list, sa_column=Column(JSON))
     items_json: List[Dict[str, Any]] = Field(default_factory=list, sa_column=Column(JSON))
@@ -68,7 +87,7 @@ class ShoppingList(SQLModel, table=True):
 
 
 class Skill(SQLModel, table=True):
-    id: str = Field(default_factory=_uuid, primary_key=True)
+    id: str = Field(default_factory=new_id, primary_key=True)
     name: str
     cadence_per_week: int = Field(default=1, ge=0)
     session_length_min: int = Field(default=30, ge=0)
@@ -78,7 +97,7 @@ class Skill(SQLModel, table=True):
 
 
 class SkillSession(SQLModel, table=True):
-    id: str = Field(default_factory=_uuid, primary_key=True)
+    id: str = Field(default_factory=new_id, primary_key=True)
     skill_id: str = Field(foreign_key="skill.id")
     event_id: Optional[str] = Field(default=None, foreign_key="event.id")
     scheduled_start: datetime
@@ -90,13 +109,16 @@ class SkillSession(SQLModel, table=True):
 
 
 class PantryItem(SQLModel, table=True):
-    id: str = Field(default_factory=_uuid, primary_key=True)
+    # One item per case-insensitive name: the upsert's ON CONFLICT target, and a seek for lookups.
+    __table_args__ = (Index("ix_pantryitem_lower_name", func.lower(text("name")), unique=True),)
+
+    id: str = Field(default_factory=new_id, primary_key=True)
     name: str = Field(index=True)
     quantity: float = Field(default=0)
     unit: Optional[str] = None
     category: Optional[str] = None
     opened_at: Optional[date] = None
     use_by: Optional[date] = Field(default=None, index=True)
-    best_before: Optional[date] = None
+    best_before: Optional[date] = Field(default=None, index=True)
     notes: Optional[str] = None
     updated_at: datetime = Field(default_factory=_utcnow, index=True)
@@ -1,15 +1,19 @@
 from datetime import date, datetime, timedelta, timezone
 from typing import Dict, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel, Field
-from sqlalchemy import func
-from sqlmodel import Session, select
+from sqlalchemy import func, or_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from .database import get_session
 from .models import PantryItem
 
 router = APIRouter()
+# Overwritten when an item with the same case-insensitive name already exists.
+PANTRY_UPSERT_COLUMNS = ("quantity", "unit", "category", "opened_at", "use_by", "best_before", "notes", "updated_at")
 
 
 class PantryUpsertRequest(BaseModel):
@@ -37,11 +41,9 @@ class PantryResponse(BaseModel):
     unsafe: bool = False
 
     @classmethod
-    def from_model(cls, item: PantryItem) -> "PantryResponse":
-        unsafe = False
-        today = date.today()
-        if item.use_by and item.use_by < today:
-            unsafe = True
+    def from_model(cls, item: PantryItem, today: Optional[date] = None) -> "PantryResponse":
+        # Callers converting many rows pass one ``today``; items without a use-by date never need it.
+        unsafe = item.use_by is not None and item.use_by < (today or date.today())
         return cls(
             id=item.id,
             name=item.name,
@@ -57,25 +59,17 @@ class PantryResponse(BaseModel):
         )
 
 
+class ExpiringItem(BaseModel):
+    name: str
+    use_by: Optional[str]
+    best_before: Optional[str]
+    unsafe: bool
+
+
 @router.post("/pantry.add_or_update", response_model=PantryResponse)
-def pantry_add_or_update(payload: PantryUpsertRequest, session: Session = Depends(get_session)):
-    lowered = payload.name.strip().lower()
-    existing = session.exec(select(PantryItem).where(func.lower(PantryItem.name) == lowered)).first()
+async def pantry_add_or_update(payload: PantryUpsertRequest, session: AsyncSession = Depends(get_session)):
     now = datetime.now(timezone.utc)
-    if existing:
-        existing.quantity = payload.qty
-        existing.unit = payload.unit
-        existing.category = payload.category
-        existing.opened_at = payload.opened_at
-        existing.use_by = payload.use_by
-        existing.best_before = payload.best_before
-        existing.notes = payload.notes
-        existing.updated_at = now
-        session.add(existing)
-        session.commit()
-        session.refresh(existing)
-        return PantryResponse.from_model(existing)
-    item = PantryItem(
+    stmt = sqlite_insert(PantryItem).values(
         name=payload.name.strip(),
         quantity=payload.qty,
         unit=payload.unit,
@@ -86,31 +80,34 @@ def pantry_add_or_update(payload: PantryUpsertRequest, session: Session = Depend
         notes=payload.notes,
         updated_at=now,
     )
-    session.add(item)
-    session.commit()
-    session.refresh(item)
+    # Single statement against ix_pantryitem_lower_name; an existing item keeps its id and spelling.
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[func.lower(PantryItem.name)],
+        set_={column: stmt.excluded[column] for column in PANTRY_UPSERT_COLUMNS},
+    )
+    item = (
+        await session.exec(stmt.returning(PantryItem), execution_options={"populate_existing": True})
+    ).scalar_one()
+    await session.commit()
     return PantryResponse.from_model(item)
 
 
-@router.get("/pantry.expiring", response_model=Dict[str, Dict[str, Optional[str]]])
-def pantry_expiring(within_days: int = Query(3, ge=0), session: Session = Depends(get_session)):
+@router.get("/pantry.expiring", response_model=Dict[str, ExpiringItem])
+async def pantry_expiring(within_days: int = Query(3, ge=0), session: AsyncSession = Depends(get_session)):
     today = date.today()
     horizon = today + timedelta(days=within_days)
-    items = session.exec(select(PantryItem)).all()
-    expiring = {}
-    for item in items:
-        if item.use_by and item.use_by <= horizon:
-            expiring[item.id] = {
-                "name": item.name,
-                "use_by": item.use_by.isoformat(),
-                "best_before": item.best_before.isoformat() if item.best_before else None,
-                "unsafe": item.use_by < today,
-            }
-        elif item.best_before and item.best_before <= horizon:
-            expiring[item.id] = {
-                "name": item.name,
-                "use_by": item.use_by.isoformat() if item.use_by else None,
-                "best_before": item.best_before.isoformat(),
-                "unsafe": False,
-            }
-    return expiring
+    # NULL dates never compare <= horizon, and each arm of the OR can use its own date index.
+    rows = await session.exec(
+        select(PantryItem.id, PantryItem.name, PantryItem.use_by, PantryItem.best_before).where(
+            or_(PantryItem.use_by <= horizon, PantryItem.best_before <= horizon)
+        )
+    )
+    return {
+        item_id: {
+            "name": name,
+            "use_by": use_by.isoformat() if use_by else None,
+            "best_before": best_before.isoformat() if best_before else None,
+            "unsafe": bool(use_by and use_by < today),
+        }
+        for item_id, name, use_by, best_before in rows
+    }
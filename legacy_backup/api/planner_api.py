@@ -1,12 +1,15 @@
 from datetime import date, datetime, time, timedelta, timezone
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
-from sqlmodel import Session, select
+from sqlalchemy import case
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from .database import get_session
-from .models import Event, Memory, PlanWeek
+from .models import Event, Memory, PlanWeek, new_id
 
 router = APIRouter()
 TZ_UTC = timezone.utc
@@ -18,6 +21,9 @@ DEFAULT_MEAL_WINDOWS = {
     "dinner": {"hour": 18, "minute": 30, "duration_min": 75},
 }
 
+PREP_LEAD = timedelta(minutes=45)
+TRAVEL_LEAD = timedelta(minutes=15)
+
 
 class PlanGenerateRequest(BaseModel):
     week: str = Field(..., description="ISO week string, e.g. 2024-W10")
@@ -44,33 +50,31 @@ class WindowsResponse(BaseModel):
     windows: List[Dict[str, Any]]
 
 
+@lru_cache(maxsize=256)
 def _iso_week_to_date(week_str: str) -> date:
     try:
         year, week = week_str.split("-W")
-        week_num = int(week)
-        return datetime.strptime(f"{year} {week_num} 1", "%G %V %u").date()
-    except Exception as exc:  # pragma: no cover
+        return date.fromisocalendar(int(year), int(week), 1)
+    except ValueError as exc:
         raise HTTPException(400, "Invalid ISO week format (use YYYY-Www)") from exc
 
 
+_MEALS_TEMPLATE = tuple(
+    {"name": meal_name, "recipe_id": None, "notes": "Auto-generated placeholder"}
+    for meal_name in ("breakfast", "lunch", "dinner")
+)
+
+
 def _default_plan(week_start: date) -> Dict[str, Any]:
-    days: List[Dict[str, Any]] = []
-    for offset in range(7):
-        d = week_start + timedelta(days=offset)
-        day_plan = {
-            "date": d.isoformat(),
-            "meals": [],
-        }
-        for meal_name in ("breakfast", "lunch", "dinner"):
-            day_plan["meals"].append(
-                {
-                    "name": meal_name,
-                    "recipe_id": None,
-                    "notes": "Auto-generated placeholder",
-                }
-            )
-        days.append(day_plan)
-    return {"days": days}
+    return {
+        "days": [
+            {
+                "date": (week_start + timedelta(days=offset)).isoformat(),
+                "meals": [dict(meal) for meal in _MEALS_TEMPLATE],
+            }
+            for offset in range(7)
+        ]
+    }
 
 
 def _estimate_macros(people_per_meal: Dict[str, int]) -> Dict[str, Any]:
@@ -85,7 +89,7 @@ def _estimate_macros(people_per_meal: Dict[str, int]) -> Dict[str, Any]:
 
 
 @router.post("/plan.generate_week", response_model=PlanGenerateResponse)
-def plan_generate_week(payload: PlanGenerateRequest, session: Session = Depends(get_session)):
+async def plan_generate_week(payload: PlanGenerateRequest, session: AsyncSession = Depends(get_session)):
     week_start = _iso_week_to_date(payload.week)
     plan = PlanWeek(
         week_start=week_start,
@@ -96,31 +100,51 @@ def plan_generate_week(payload: PlanGenerateRequest, session: Session = Depends(
         event_ids_json={},
     )
     session.add(plan)
-    session.commit()
+    await session.commit()
     return PlanGenerateResponse(plan_id=plan.id, macros=plan.macros_json)
 
 
-def _build_event_time(day: date, meal_name: str, window_cfg: Dict[str, Dict[str, int]], tz_offset: int) -> (datetime, datetime):
-    cfg = window_cfg.get(meal_name, DEFAULT_MEAL_WINDOWS.get(meal_name, DEFAULT_MEAL_WINDOWS["dinner"]))
-    start_local = datetime.combine(day, time(hour=cfg.get("hour", 18), minute=cfg.get("minute", 0)))
-    duration = timedelta(minutes=cfg.get("duration_min", 60))
-    tz = timezone(timedelta(minutes=tz_offset))
-    start_dt = start_local.replace(tzinfo=tz).astimezone(TZ_UTC)
-    end_dt = (start_local + duration).replace(tzinfo=tz).astimezone(TZ_UTC)
+MealWindow = Tuple[time, timedelta]
+
+
+def _meal_window(cfg: Dict[str, int]) -> MealWindow:
+    return time(hour=cfg.get("hour", 18), minute=cfg.get("minute", 0)), timedelta(minutes=cfg.get("duration_min", 60))
+
+
+_FALLBACK_WINDOW = _meal_window(DEFAULT_MEAL_WINDOWS["dinner"])
+
+
+def _resolve_meal_windows(window_cfg: Dict[str, Dict[str, int]]) -> Dict[str, MealWindow]:
+    """Per-request lookup of (start time, duration); request windows override the defaults."""
+    return {name: _meal_window(cfg) for name, cfg in {**DEFAULT_MEAL_WINDOWS, **window_cfg}.items()}
+
+
+def _build_event_time(day: date, window: MealWindow, tz: timezone) -> Tuple[datetime, datetime]:
+    start_time, duration = window
+    start_dt = datetime.combine(day, start_time, tzinfo=tz)
+    end_dt = start_dt + duration
+    if tz is not TZ_UTC:
+        start_dt, end_dt = start_dt.astimezone(TZ_UTC), end_dt.astimezone(TZ_UTC)
     return start_dt, end_dt
 
 
 @router.post("/plan.apply_to_calendar")
-def plan_apply_to_calendar(payload: PlanApplyRequest, session: Session = Depends(get_session)):
-    plan = session.get(PlanWeek, payload.plan_id)
+async def plan_apply_to_calendar(payload: PlanApplyRequest, session: AsyncSession = Depends(get_session)):
+    plan = await session.get(PlanWeek, payload.plan_id)
     if not plan:
         raise HTTPException(404, "Plan not found")
     plan_data = plan.plan_json or {}
     days = plan_data.get("days", [])
-    tz_offset = payload.tz_offset_minutes
-    window_cfg = payload.meal_windows or DEFAULT_MEAL_WINDOWS
+    tz = timezone(timedelta(minutes=payload.tz_offset_minutes))
+    windows = _resolve_meal_windows(payload.meal_windows or DEFAULT_MEAL_WINDOWS)
 
-    event_refs: Dict[str, List[str]] = plan.event_ids_json or {}
+    event_refs: Dict[str, List[str]] = dict(plan.event_ids_json or {})
+    rows: List[Dict[str, Any]] = []
+
+    def add_row(day_ids: List[str], **values: Any) -> None:
+        event_id = new_id()
+        rows.append({"id": event_id, "description": None, **values})
+        day_ids.append(event_id)
 
     for day_entry in days:
         day_date = date.fromisoformat(day_entry["date"])
@@ -128,65 +152,69 @@ def plan_apply_to_calendar(payload: PlanApplyRequest, session: Session = Depends
         for meal in day_entry.get("meals", []):
             meal_name = meal.get("name", "meal")
             title = f"{meal_name.title()}"
-            start_dt, end_dt = _build_event_time(day_date, meal_name, window_cfg, tz_offset)
-            meal_event = Event(
+            start_dt, end_dt = _build_event_time(day_date, windows.get(meal_name, _FALLBACK_WINDOW), tz)
+            meta = {"meal": meal}
+            add_row(
+                meal_events,
                 title=title,
                 start=start_dt,
                 end=end_dt,
                 category="meal",
                 color="#7FB069",
                 description=meal.get("notes"),
-                meta_json={"meal": meal},
+                meta_json=meta,
             )
-            session.add(meal_event)
-            session.commit()
-            meal_events.append(meal_event.id)
 
             if payload.include_prep:
-                prep_start = start_dt - timedelta(minutes=45)
-                prep_end = start_dt - timedelta(minutes=15)
-                prep_event = Event(
+                add_row(
+                    meal_events,
                     title=f"Prep: {title}",
-                    start=prep_start,
-                    end=prep_end,
+                    start=start_dt - PREP_LEAD,
+                    end=start_dt - TRAVEL_LEAD,
                     category="prep",
                     color="#B5D99C",
-                    meta_json={"meal": meal},
+                    meta_json=meta,
                 )
-                session.add(prep_event)
-                session.commit()
-                meal_events.append(prep_event.id)
 
             if payload.include_travel:
-                travel_start = start_dt - timedelta(minutes=15)
-                travel_end = start_dt
-                travel_event = Event(
+                add_row(
+                    meal_events,
                     title=f"Travel: {title}",
-                    start=travel_start,
-                    end=travel_end,
+                    start=start_dt - TRAVEL_LEAD,
+                    end=start_dt,
                     category="travel",
                     color="#7AA5D2",
-                    meta_json={"meal": meal},
+                    meta_json=meta,
                 )
-                session.add(travel_event)
-                session.commit()
-                meal_events.append(travel_event.id)
         if meal_events:
             event_refs[day_entry["date"]] = meal_events
 
-    plan.event_ids_json = event_refs
-    session.add(plan)
-    session.commit()
+    try:
+        # Core executemany: these rows are never read back, so skip the ORM unit of work.
+        if rows:
+            await session.exec(Event.__table__.insert(), params=rows)
+        plan.event_ids_json = event_refs
+        session.add(plan)
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
     return {"plan_id": plan.id, "event_ids": event_refs}
 
 
 @router.get("/windows.active", response_model=WindowsResponse)
-def windows_active(date: date, session: Session = Depends(get_session)):
-    key = f"windows:{date.isoformat()}"
-    record = session.get(Memory, key)
-    if not record:
-        prefix = f"windows:{date.strftime('%A').lower()}"
-        record = session.exec(select(Memory).where(Memory.key == prefix)).first()
+async def windows_active(date: date, session: AsyncSession = Depends(get_session)):
+    exact_key = f"windows:{date.isoformat()}"
+    weekday_key = f"windows:{date.strftime('%A').lower()}"
+    # Exact date wins over the weekday fallback.
+    record = (
+        await session.exec(
+            select(Memory)
+            .where(Memory.key.in_((exact_key, weekday_key)))
+            .order_by(case((Memory.key == exact_key, 0), else_=1))
+            .limit(1)
+        )
+    ).first()
     if not record:
         return WindowsResponse(windows=[])
     value = record.value_json or {}
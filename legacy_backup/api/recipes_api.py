@@ -1,16 +1,49 @@
+import time
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel, Field
+from fastapi.responses import Response
+from pydantic import BaseModel, Field, TypeAdapter
 from sqlalchemy import func
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from .database import get_session
 from .models import Recipe
+from .responses import OrjsonResponse
 
 router = APIRouter()
 
+RECIPES_CACHE_TTL_SEC = 300.0
+RECIPES_CACHE_MAX_ENTRIES = 256  # search terms are caller-chosen, so keep the key space bounded
+
+# Rendered recipes.get / recipes.list bodies: (endpoint, arg, *version) -> (expires_at, body).
+# The version is the recipe count and newest updated_at, read per request: every save or delete
+# changes it, in whichever worker process made the write, so a stale body is never served.
+_recipes_cache: Dict[Tuple[Any, ...], Tuple[float, bytes]] = {}
+
+
+async def _recipes_version(session: AsyncSession) -> Tuple[int, Optional[datetime]]:
+    """Row count and newest updated_at (an index seek); cheaper than loading and rendering recipes."""
+    count, newest = (await session.exec(select(func.count(), func.max(Recipe.updated_at)))).one()
+    return count, newest
+
+
+def _cached_body(key: Tuple[Any, ...]) -> Optional[bytes]:
+    hit = _recipes_cache.get(key)
+    if hit is not None and hit[0] > time.monotonic():
+        return hit[1]
+    return None
+
+
+def _cache_body(key: Tuple[Any, ...], content: Any) -> bytes:
+    if len(_recipes_cache) >= RECIPES_CACHE_MAX_ENTRIES:
+        _recipes_cache.clear()
+    body = OrjsonResponse(content).body
+    _recipes_cache[key] = (time.monotonic() + RECIPES_CACHE_TTL_SEC, body)
+    return body
+
 
 class Ingredient(BaseModel):
     name: str
@@ -19,6 +52,10 @@ class Ingredient(BaseModel):
     category: Optional[str] = None
 
 
+# One compiled validator/serialiser for whole ingredient lists instead of a model call per item.
+INGREDIENTS_ADAPTER = TypeAdapter(List[Ingredient])
+
+
 class RecipeSaveRequest(BaseModel):
     id: Optional[str] = None
     name: str
@@ -38,7 +75,7 @@ class RecipeResponse(BaseModel):
 
     @classmethod
     def from_model(cls, recipe: Recipe) -> "RecipeResponse":
-        ingredients = [Ingredient(**item) for item in recipe.ingredients_json or []]
+        ingredients = INGREDIENTS_ADAPTER.validate_python(recipe.ingredients_json or [])
         return cls(
             id=recipe.id,
             name=recipe.name,
@@ -50,17 +87,18 @@ class RecipeResponse(BaseModel):
 
 
 @router.post("/recipes.save", response_model=RecipeResponse)
-def recipes_save(payload: RecipeSaveRequest, session: Session = Depends(get_session)):
+async def recipes_save(payload: RecipeSaveRequest, session: AsyncSession = Depends(get_session)):
     now = datetime.now(timezone.utc)
+    ingredients_json = INGREDIENTS_ADAPTER.dump_python(payload.ingredients)
     if payload.id:
-        recipe = session.get(Recipe, payload.id)
+        recipe = await session.get(Recipe, payload.id)
     else:
         recipe = None
     if recipe:
         recipe.name = payload.name
         recipe.description = payload.description
         recipe.instructions = payload.instructions
-        recipe.ingredients_json = [item.model_dump() for item in payload.ingredients]
+        recipe.ingredients_json = ingredients_json
         recipe.tags = payload.tags
         recipe.updated_at = now
     else:
@@ -68,35 +106,43 @@ def recipes_save(payload: RecipeSaveRequest, session: Session = Depends(get_sess
             name=payload.name,
             description=payload.description,
             instructions=payload.instructions,
-            ingredients_json=[item.model_dump() for item in payload.ingredients],
+            ingredients_json=ingredients_json,
             tags=payload.tags,
             created_at=now,
             updated_at=now,
         )
         session.add(recipe)
     recipe.updated_at = now
-    session.commit()
-    session.refresh(recipe)
+    await session.commit()
     return RecipeResponse.from_model(recipe)
 
 
 @router.get("/recipes.get", response_model=RecipeResponse)
-def recipes_get(id: str, session: Session = Depends(get_session)):
-    recipe = session.get(Recipe, id)
-    if not recipe:
-        raise HTTPException(404, "Recipe not found")
-    return RecipeResponse.from_model(recipe)
+async def recipes_get(id: str, session: AsyncSession = Depends(get_session)):
+    key = ("get", id, *await _recipes_version(session))
+    body = _cached_body(key)
+    if body is None:
+        recipe = await session.get(Recipe, id)
+        if not recipe:
+            raise HTTPException(404, "Recipe not found")
+        body = _cache_body(key, RecipeResponse.from_model(recipe).model_dump())
+    return Response(body, media_type="application/json")
 
 
 @router.get("/recipes.list", response_model=List[RecipeResponse])
-def recipes_list(search: Optional[str] = Query(None), session: Session = Depends(get_session)):
+async def recipes_list(search: Optional[str] = Query(None), session: AsyncSession = Depends(get_session)):
+    key = ("list", search.lower() if search else None, *await _recipes_version(session))
+    body = _cached_body(key)
+    if body is not None:
+        return Response(body, media_type="application/json")
     query = select(Recipe)
     if search:
         pattern = f"%{search.lower()}%"
         query = query.where(func.lower(Recipe.name).like(pattern))
     query = query.order_by(Recipe.created_at.desc())
-    recipes = session.exec(query).all()
-    return [RecipeResponse.from_model(r) for r in recipes]
+    recipes = (await session.exec(query)).all()
+    body = _cache_body(key, [RecipeResponse.from_model(r).model_dump() for r in recipes])
+    return Response(body, media_type="application/json")
 
 
 class RecipeDeleteRequest(BaseModel):
@@ -104,10 +150,10 @@ class RecipeDeleteRequest(BaseModel):
 
 
 @router.post("/recipes.delete")
-def recipes_delete(payload: RecipeDeleteRequest, session: Session = Depends(get_session)):
-    recipe = session.get(Recipe, payload.id)
+async def recipes_delete(payload: RecipeDeleteRequest, session: AsyncSession = Depends(get_session)):
+    recipe = await session.get(Recipe, payload.id)
     if not recipe:
         raise HTTPException(404, "Recipe not found")
-    session.delete(recipe)
-    session.commit()
+    await session.delete(recipe)
+    await session.commit()
     return {"status": "deleted"}
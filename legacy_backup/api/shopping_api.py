@@ -1,12 +1,17 @@
 from collections import defaultdict
-from typing import Dict, List, Optional
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
-from sqlmodel import Session, select
+from sqlalchemy import LargeBinary, cast, func, or_
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from .database import get_session
-from .models import PantryItem, PlanWeek, Recipe, ShoppingList
+from .models import PantryItem, PlanWeek, Recipe, ShoppingList, new_id
+from .responses import OrjsonResponse
 
 router = APIRouter()
 
@@ -30,46 +35,78 @@ class ShoppingListResponse(BaseModel):
     items_by_category: Dict[str, List[ShoppingItem]]
 
 
-def _gather_ingredients(session: Session, recipe_ids: List[str]) -> List[ShoppingItem]:
+async def _gather_ingredients(session: AsyncSession, recipe_ids: List[str]) -> List[ShoppingItem]:
+    if not recipe_ids:
+        return []
+    # One IN query for every recipe, fetching only the ingredient lists.
+    rows = await session.exec(select(Recipe.id, Recipe.ingredients_json).where(Recipe.id.in_(recipe_ids)))
+    by_id = dict(rows.all())
     ingredients: List[ShoppingItem] = []
     for recipe_id in recipe_ids:
-        recipe = session.get(Recipe, recipe_id)
-        if not recipe:
+        if recipe_id not in by_id:
             raise HTTPException(404, f"Recipe {recipe_id} not found")
-        for ing in recipe.ingredients_json or []:
+        for ing in by_id[recipe_id] or []:
             ingredients.append(ShoppingItem(**ing))
     return ingredients
 
 
-def _aggregate_items(items: List[ShoppingItem]) -> Dict[str, ShoppingItem]:
-    aggregated: Dict[str, ShoppingItem] = {}
+@dataclass(slots=True)
+class _AggItem:
+    """Running total for one (name, unit) line; only turned into a ShoppingItem for the response."""
+
+    name: str
+    quantity: float
+    unit: Optional[str]
+    category: Optional[str]
+    notes: Optional[str]
+
+
+def _aggregate_items(items: List[ShoppingItem]) -> Dict[Tuple[str, str], _AggItem]:
+    aggregated: Dict[Tuple[str, str], _AggItem] = {}
     for item in items:
         key = (item.name.lower(), item.unit or "")
-        if key not in aggregated:
-            aggregated[key] = ShoppingItem(**item.model_dump())
+        agg = aggregated.get(key)
+        if agg is None:
+            aggregated[key] = _AggItem(item.name, item.quantity, item.unit, item.category, item.notes)
         else:
-            aggregated[key].quantity += item.quantity or 0
-            aggregated[key].notes = aggregated[key].notes or item.notes
-            aggregated[key].category = aggregated[key].category or item.category
+            agg.quantity += item.quantity or 0
+            agg.notes = agg.notes or item.notes
+            agg.category = agg.category or item.category
     return aggregated
 
 
-def _subtract_pantry(items: Dict[str, ShoppingItem], pantry: List[PantryItem]) -> None:
-    for p in pantry:
-        key = (p.name.lower(), p.unit or "")
-        if key in items:
-            remaining = items[key].quantity - (p.quantity or 0)
-            items[key].quantity = max(0.0, remaining)
-            if items[key].quantity == 0:
-                items[key].notes = (items[key].notes or "") + " (pantry)"
+async def _subtract_pantry(session: AsyncSession, items: Dict[Tuple[str, str], _AggItem]) -> None:
+    if not items:
+        return
+    # Only pantry rows named on the list are read (via ix_pantryitem_lower_name). SQLite's lower()
+    # folds ASCII only, so names with other letters are matched in Python against every pantry row
+    # holding a non-ASCII character (text length differs from byte length).
+    names = {name for name, _unit in items}
+    ascii_names = {name for name in names if name.isascii()}
+    candidates = func.lower(PantryItem.name).in_(ascii_names)
+    if len(ascii_names) < len(names):
+        candidates = or_(
+            candidates, func.length(PantryItem.name) != func.length(cast(PantryItem.name, LargeBinary))
+        )
+    rows = await session.exec(select(PantryItem.name, PantryItem.unit, PantryItem.quantity).where(candidates))
+    stock: Dict[Tuple[str, str], float] = defaultdict(float)
+    for name, unit, quantity in rows:
+        stock[(name.lower(), unit or "")] += quantity or 0
+    for key, on_hand in stock.items():
+        item = items.get(key)
+        if item is None:
+            continue
+        item.quantity = max(0.0, item.quantity - on_hand)
+        if item.quantity == 0:
+            item.notes = (item.notes or "") + " (pantry)"
 
 
 @router.post("/shopping.generate", response_model=ShoppingListResponse)
-def shopping_generate(payload: ShoppingGenerateRequest, session: Session = Depends(get_session)):
+async def shopping_generate(payload: ShoppingGenerateRequest, session: AsyncSession = Depends(get_session)):
     recipe_ids: List[str] = []
     direct_items: List[ShoppingItem] = []
     if payload.plan_id:
-        plan = session.get(PlanWeek, payload.plan_id)
+        plan = await session.get(PlanWeek, payload.plan_id)
         if not plan:
             raise HTTPException(404, "Plan not found")
         plan_data = plan.plan_json or {}
@@ -83,33 +120,33 @@ def shopping_generate(payload: ShoppingGenerateRequest, session: Session = Depen
     recipe_ids.extend(payload.recipe_ids)
     recipe_ids = list(dict.fromkeys(recipe_ids))
 
-    items = _gather_ingredients(session, recipe_ids)
+    items = await _gather_ingredients(session, recipe_ids)
     items.extend(direct_items)
     aggregated = _aggregate_items(items)
 
     if payload.subtract_pantry:
-        pantry_items = session.exec(select(PantryItem)).all()
-        _subtract_pantry(aggregated, pantry_items)
+        await _subtract_pantry(session, aggregated)
 
-    grouped: Dict[str, List[ShoppingItem]] = defaultdict(list)
+    grouped: Dict[str, List[_AggItem]] = defaultdict(list)
     for item in aggregated.values():
         category = item.category or "uncategorized"
         if item.quantity <= 0:
             continue
         grouped[category].append(item)
 
-    shopping = ShoppingList(
-        plan_id=payload.plan_id,
-        recipe_ids=recipe_ids,
-        items_json=[item.model_dump() for item in aggregated.values()],
+    # Core insert: the row is never read back. The JSON column's orjson serialiser encodes the
+    # _AggItem dataclasses as-is, so no per-item dict is built for items_json.
+    list_id = new_id()
+    await session.exec(
+        ShoppingList.__table__.insert().values(
+            id=list_id,
+            plan_id=payload.plan_id,
+            recipe_ids=recipe_ids,
+            items_json=list(aggregated.values()),
+            generated_at=datetime.now(timezone.utc),
+        )
     )
-    session.add(shopping)
-    session.commit()
-    session.refresh(shopping)
-
-    grouped_serializable = {
-        category: [ShoppingItem(**i.model_dump()) for i in items]
-        for category, items in grouped.items()
-    }
+    await session.commit()
 
-    return ShoppingListResponse(list_id=shopping.id, items_by_category=grouped_serializable)
+    # orjson serialises the _AggItem dataclasses directly; response_model stays for the OpenAPI schema.
+    return OrjsonResponse({"list_id": list_id, "items_by_category": grouped})
@@ -1,15 +1,19 @@
 from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
 from typing import Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
-from sqlmodel import Session, select
+from sqlalchemy import delete
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from .database import get_session
-from .models import Event, Skill, SkillSession
+from .models import Event, EventAttendee, Skill, SkillSession
 
 router = APIRouter()
 TZ_UTC = timezone.utc
+ONE_DAY = timedelta(days=1)
 
 
 class SkillUpsertRequest(BaseModel):
@@ -69,18 +73,19 @@ class BreakPolicyRequest(BaseModel):
     break_length_minutes: int = Field(default=15, ge=5)
 
 
+@lru_cache(maxsize=256)
 def _iso_week_start(week: str) -> date:
     try:
         year, week_num = week.split("-W")
-        return datetime.strptime(f"{year} {int(week_num)} 1", "%G %V %u").date()
-    except Exception as exc:  # pragma: no cover
+        return date.fromisocalendar(int(year), int(week_num), 1)
+    except ValueError as exc:
         raise HTTPException(400, "Invalid ISO week format") from exc
 
 
 @router.post("/skills.upsert", response_model=SkillResponse)
-def skills_upsert(payload: SkillUpsertRequest, session: Session = Depends(get_session)):
+async def skills_upsert(payload: SkillUpsertRequest, session: AsyncSession = Depends(get_session)):
     if payload.id:
-        skill = session.get(Skill, payload.id)
+        skill = await session.get(Skill, payload.id)
     else:
         skill = None
     if skill:
@@ -99,56 +104,58 @@ def skills_upsert(payload: SkillUpsertRequest, session: Session = Depends(get_se
             metadata_json=payload.metadata,
         )
         session.add(skill)
-    session.commit()
-    session.refresh(skill)
+    await session.commit()
     return SkillResponse.from_model(skill)
 
 
 def _schedule_slots(week_start: date, cadence: int, start_hour: int, gap_minutes: int) -> List[datetime]:
     slots: List[datetime] = []
-    day_pointer = week_start
-    current_time = time(hour=start_hour, minute=0)
+    cursor = datetime.combine(week_start, time(hour=start_hour))
+    gap = timedelta(minutes=gap_minutes)
     for _ in range(cadence):
-        slot_datetime = datetime.combine(day_pointer, current_time)
-        slots.append(slot_datetime)
-        current_dt = slot_datetime + timedelta(minutes=gap_minutes)
-        day_pointer = current_dt.date()
-        current_time = current_dt.time()
-        if current_time.hour >= 20:
-            day_pointer += timedelta(days=1)
-            current_time = time(hour=start_hour, minute=0)
+        slots.append(cursor)
+        cursor += gap
+        if cursor.hour >= 20:
+            # Past 20:00: next slot is start_hour on the following day.
+            cursor = cursor.replace(hour=start_hour, minute=0, second=0, microsecond=0) + ONE_DAY
     return slots
 
 
+async def _delete_events(session: AsyncSession, event_ids: List[str]) -> None:
+    # Bulk Core deletes bypass the ORM after_delete hook, so attendee rows are removed here too.
+    if not event_ids:
+        return
+    await session.exec(delete(EventAttendee).where(EventAttendee.event_id.in_(event_ids)))
+    await session.exec(delete(Event).where(Event.id.in_(event_ids)))
+
+
 @router.post("/skills.schedule_week", response_model=ScheduleWeekResponse)
-def skills_schedule_week(payload: ScheduleWeekRequest, session: Session = Depends(get_session)):
+async def skills_schedule_week(payload: ScheduleWeekRequest, session: AsyncSession = Depends(get_session)):
     week_start = _iso_week_start(payload.week)
     skills_query = select(Skill)
     if payload.skill_ids:
         skills_query = skills_query.where(Skill.id.in_(payload.skill_ids))
-    skills = session.exec(skills_query).all()
+    skills = (await session.exec(skills_query)).all()
     if not skills:
         raise HTTPException(404, "No skills found")
 
     tz = timezone(timedelta(minutes=payload.tz_offset_minutes))
-    scheduled_ids: List[str] = []
 
     # Remove existing sessions for the week to avoid duplicates
     week_end = week_start + timedelta(days=7)
-    existing_sessions = session.exec(
-        select(SkillSession).where(
-            SkillSession.scheduled_start >= datetime.combine(week_start, time.min, tzinfo=TZ_UTC),
-            SkillSession.scheduled_start < datetime.combine(week_end, time.min, tzinfo=TZ_UTC),
-        )
+    in_week = (
+        SkillSession.scheduled_start >= datetime.combine(week_start, time.min, tzinfo=TZ_UTC),
+        SkillSession.scheduled_start < datetime.combine(week_end, time.min, tzinfo=TZ_UTC),
+    )
+    stale_event_ids = (
+        await session.exec(select(SkillSession.event_id).where(*in_week, SkillSession.event_id.is_not(None)))
     ).all()
-    for sess in existing_sessions:
-        if sess.event_id:
-            event = session.get(Event, sess.event_id)
-            if event:
-                session.delete(event)
-        session.delete(sess)
-    session.commit()
+    await session.exec(delete(SkillSession).where(*in_week))
+    await _delete_events(session, list(stale_event_ids))
 
+    # Ids come from default factories, so sessions can point at their events before anything is flushed.
+    new_rows: List[object] = []
+    scheduled_ids: List[str] = []
     for skill in skills:
         slots = _schedule_slots(week_start, skill.cadence_per_week, payload.start_hour, payload.gap_minutes)
         for slot in slots:
@@ -163,8 +170,6 @@ def skills_schedule_week(payload: ScheduleWeekRequest, session: Session = Depend
                 color="#C44E52",
                 meta_json={"skill_id": skill.id},
             )
-            session.add(event)
-            session.commit()
             skill_session = SkillSession(
                 skill_id=skill.id,
                 event_id=event.id,
@@ -173,63 +178,71 @@ def skills_schedule_week(payload: ScheduleWeekRequest, session: Session = Depend
                 outcome=None,
                 next_focus=None,
             )
-            session.add(skill_session)
-            session.commit()
+            new_rows += (event, skill_session)
             scheduled_ids.append(skill_session.id)
+    session.add_all(new_rows)
+    # One transaction for the cleanup and every new row.
+    await session.commit()
     return ScheduleWeekResponse(scheduled_sessions=scheduled_ids)
 
 
 @router.post("/skills.log_session")
-def skills_log_session(payload: SkillLogRequest, session: Session = Depends(get_session)):
-    skill_session = session.get(SkillSession, payload.session_id)
+async def skills_log_session(payload: SkillLogRequest, session: AsyncSession = Depends(get_session)):
+    skill_session = await session.get(SkillSession, payload.session_id)
     if not skill_session:
         raise HTTPException(404, "Session not found")
     skill_session.outcome = payload.outcome
     skill_session.rating = payload.rating
     skill_session.next_focus = payload.next_focus
     session.add(skill_session)
-    session.commit()
+    await session.commit()
     return {"status": "logged"}
 
 
 @router.post("/breaks.apply_policy")
-def breaks_apply_policy(payload: BreakPolicyRequest, session: Session = Depends(get_session)):
+async def breaks_apply_policy(payload: BreakPolicyRequest, session: AsyncSession = Depends(get_session)):
     start_dt = datetime.combine(payload.start_date, time.min).replace(tzinfo=TZ_UTC)
     end_dt = datetime.combine(payload.end_date + timedelta(days=1), time.min).replace(tzinfo=TZ_UTC)
-    work_events = session.exec(
-        select(Event).where(
-            Event.category == payload.work_category,
-            Event.start >= start_dt,
-            Event.end <= end_dt,
+    work_events = (
+        await session.exec(
+            select(Event.id, Event.start, Event.end).where(
+                Event.category == payload.work_category,
+                Event.start >= start_dt,
+                Event.end <= end_dt,
+            )
         )
     ).all()
 
     # Remove existing breaks in window
-    existing_breaks = session.exec(
-        select(Event).where(
-            Event.category == payload.break_category,
-            Event.start >= start_dt,
-            Event.end <= end_dt,
+    existing_break_ids = (
+        await session.exec(
+            select(Event.id).where(
+                Event.category == payload.break_category,
+                Event.start >= start_dt,
+                Event.end <= end_dt,
+            )
         )
     ).all()
-    for ev in existing_breaks:
-        session.delete(ev)
-    session.commit()
-
-    created: List[str] = []
-    for work in work_events:
-        cursor = work.start + timedelta(minutes=payload.interval_minutes)
-        while cursor + timedelta(minutes=payload.break_length_minutes) < work.end:
-            break_event = Event(
-                title="Break",
-                start=cursor,
-                end=cursor + timedelta(minutes=payload.break_length_minutes),
-                category=payload.break_category,
-                color="#F2C14E",
-                meta_json={"source": "break_policy", "work_event_id": work.id},
+    await _delete_events(session, list(existing_break_ids))
+
+    interval = timedelta(minutes=payload.interval_minutes)
+    break_length = timedelta(minutes=payload.break_length_minutes)
+    new_breaks: List[Event] = []
+    for work_id, work_start, work_end in work_events:
+        cursor = work_start + interval
+        while cursor + break_length < work_end:
+            new_breaks.append(
+                Event(
+                    title="Break",
+                    start=cursor,
+                    end=cursor + break_length,
+                    category=payload.break_category,
+                    color="#F2C14E",
+                    meta_json={"source": "break_policy", "work_event_id": work_id},
+                )
             )
-            session.add(break_event)
-            session.commit()
-            created.append(break_event.id)
-            cursor += timedelta(minutes=payload.interval_minutes)
-    return {"created_breaks": created}
+            cursor += interval
+    session.add_all(new_breaks)
+    # One transaction for the cleanup and every new break.
+    await session.commit()
+    return {"created_breaks": [ev.id for ev in new_breaks]}
@@ -1,43 +1,118 @@
 # app.py — Luke Assistant API (Calendar + Memory + Directory, size-safe)
 
-import os, uuid, json
+import asyncio, hashlib, hmac, logging, os, time
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
-from typing import List, Optional
-
-import pytz
-from fastapi import FastAPI, Depends, HTTPException, Header, Query
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Annotated, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import ciso8601
+import orjson
+from fastapi import FastAPI, Depends, HTTPException, Header, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
-from pydantic import BaseModel, EmailStr
-from sqlmodel import Field, SQLModel, create_engine, Session, select
+from pydantic import BaseModel, StringConstraints
+from sqlalchemy import JSON, Column, Index, bindparam, event, func, inspect, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row, make_url
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Field, SQLModel, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from ulid import ULID
+
+logger = logging.getLogger(__name__)
 
 # ---------------------- Config ----------------------
 API_KEY = os.getenv("API_BEARER_KEY", "supersecret")
+EXPECTED_TOKEN = API_KEY.encode()
+BEARER_PREFIX = "bearer "
+BEARER_PREFIX_LEN = len(BEARER_PREFIX)
 DB_URL = os.getenv("DATABASE_URL", "sqlite:///calendar.db")
-LONDON = pytz.timezone("Europe/London")
+LONDON = ZoneInfo("Europe/London")
 TZ_UTC = timezone.utc
+# Columns app.py's own models have dropped; _migrate_attendees has already copied their data.
+RETIRED_COLUMNS = frozenset({"attendees_csv"})
 MAX_LIST_HOURS = 6  # guardrail for /events.list
-
-def require_bearer(authorization: Optional[str] = Header(None)):
-    if not authorization or not authorization.lower().startswith("bearer "):
+LIST_BATCH_ROWS = 500  # rows fetched + encoded per chunk when streaming /events.list
+SQLITE_MAX_PARAMS = 999  # conservative bound-parameter limit per statement (older SQLite builds)
+GROUP_COMMIT_WINDOW_SEC = 0.002  # how long the memory writer waits for more writes to share a commit
+GROUP_COMMIT_MAX = 64  # memory writes per group commit
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+
+class OrjsonResponse(JSONResponse):
+    """JSON response rendered with orjson; UTC datetimes come out as RFC 3339 with ``Z``."""
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+async def require_bearer(authorization: Optional[str] = Header(None)):
+    # async: a plain def dependency would cost a threadpool hop on every authenticated request
+    if not authorization or authorization[:BEARER_PREFIX_LEN].lower() != BEARER_PREFIX:
         raise HTTPException(401, "Missing bearer token")
-    token = authorization.split(" ", 1)[1]
-    if token != API_KEY:
+    if not hmac.compare_digest(authorization[BEARER_PREFIX_LEN:].encode(), EXPECTED_TOKEN):
         raise HTTPException(403, "Invalid token")
 
-engine = create_engine(
-    DB_URL,
-    connect_args={"check_same_thread": False, "timeout": 30},
-    pool_pre_ping=True,
+def _async_url(url: str):
+    """Plain sqlite:// URLs get the aiosqlite driver; explicit drivers are kept."""
+    parsed = make_url(url)
+    return parsed.set(drivername="sqlite+aiosqlite") if parsed.drivername == "sqlite" else parsed
+
+engine = create_async_engine(
+    _async_url(DB_URL),
+    # cached_statements: sqlite3's per-connection prepared-statement LRU (default 128).
+    connect_args={"check_same_thread": False, "timeout": 30, "cached_statements": 256},
+    # Long-lived local file connections: keep a fixed set open so the connect-time PRAGMAs and
+    # schema parse are paid once per connection, and skip the per-checkout SELECT 1 ping.
+    pool_size=8,
+    max_overflow=0,
+    pool_pre_ping=False,
+    pool_recycle=-1,
+    json_serializer=lambda value: orjson.dumps(value).decode(),
+    json_deserializer=orjson.loads,
 )
 
-# tighten SQLite a bit
-with engine.connect() as conn:
-    conn.exec_driver_sql("PRAGMA journal_mode=WAL;")
-    conn.exec_driver_sql("PRAGMA synchronous=NORMAL;")
-    conn.exec_driver_sql("PRAGMA busy_timeout=5000;")
+# tighten SQLite a bit; most of these are per-connection, so apply them on every connect
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256 MiB
+    "PRAGMA cache_size=-65536",  # 64 MiB
+    "PRAGMA foreign_keys=ON",
+)
 
-app = FastAPI(title="Luke Calendar API")
+@event.listens_for(engine.sync_engine, "connect")
+def _set_sqlite_pragmas(dbapi_conn, _record):
+    cur = dbapi_conn.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cur.execute(pragma)
+    cur.close()
+
+OPENAPI_URL = "/openapi.json"
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    async with engine.begin() as conn:
+        await conn.run_sync(_create_schema)
+    memory_writer.start()
+    yield
+    await memory_writer.stop()
+    await engine.dispose()
+
+# Built-in docs routes are disabled so /openapi.json can serve cached bytes (see below).
+app = FastAPI(
+    title="Luke Calendar API",
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None,
+    default_response_class=OrjsonResponse,
+    lifespan=lifespan,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -68,38 +143,79 @@ def custom_openapi():
 
 app.openapi = custom_openapi
 
+@lru_cache(maxsize=1)
+def openapi_json() -> bytes:
+    return orjson.dumps(app.openapi())
+
+@app.get(OPENAPI_URL, include_in_schema=False)
+async def openapi_spec():
+    return Response(openapi_json(), media_type="application/json")
+
+@app.get("/docs", include_in_schema=False)
+async def swagger_docs():
+    return get_swagger_ui_html(openapi_url=OPENAPI_URL, title=f"{app.title} - Swagger UI")
+
+@app.get("/redoc", include_in_schema=False)
+async def redoc_docs():
+    return get_redoc_html(openapi_url=OPENAPI_URL, title=f"{app.title} - ReDoc")
+
 # ---------------------- Models ----------------------
 class Event(SQLModel, table=True):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()), primary_key=True)
+    # Range scans (list_busy, has_conflict, summary_day, events.list). id and title ride along so
+    # every query except the full-row /events.list is answered from the index alone.
+    # WITHOUT ROWID: rows live in the id b-tree itself, so there is no second index duplicating
+    # every 26-char id, session.get is one seek, and index entries point at id instead of a rowid.
+    __table_args__ = (
+        Index("ix_event_span", "start", "end", "id", "title"),
+        {"sqlite_with_rowid": False},
+    )
+
+    id: str = Field(default_factory=lambda: str(ULID()), primary_key=True)  # time-sortable
     title: str
     start: datetime
     end: datetime
     location: Optional[str] = None
-    attendees_csv: Optional[str] = None
+    attendees_json: Optional[List[str]] = Field(default=None, sa_column=Column(JSON))
     description: Optional[str] = None
-    idempotency_key: Optional[str] = Field(default=None, index=True)
+    # Unique: a retry racing the original cannot insert the event twice.
+    idempotency_key: Optional[str] = Field(default=None, index=True, unique=True)
 
 class Memory(SQLModel, table=True):
+    # WITHOUT ROWID: the key b-tree holds the rows, instead of a rowid table plus a key index.
+    # Only for tables app.py owns: the api package's memory table (TTL and validity columns) in a
+    # shared calendar.db is never rebuilt, see _rebuild_without_rowid.
+    __table_args__ = {"sqlite_with_rowid": False}
+
     key: str = Field(primary_key=True)  # e.g. "equipment/kitchen.json"
     value_json: str
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(TZ_UTC))
+    updated_at: datetime = Field(
+        sa_column_kwargs={"server_default": func.current_timestamp()}, nullable=False
+    )  # stamped by SQLite (UTC), not Python
+
+# Shape check only; pydantic-core runs `pattern` on Rust's linear-time regex engine, which is far
+# cheaper per attendee than email-validator's full RFC/IDNA parse behind EmailStr.
+EMAIL_PATTERN = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+Email = Annotated[str, StringConstraints(pattern=EMAIL_PATTERN)]
 
 class EventCreate(BaseModel):
     title: str
     start: datetime
     end: datetime
     location: Optional[str] = None
-    attendees: Optional[List[EmailStr]] = None
+    attendees: Optional[List[Email]] = None
     description: Optional[str] = None
     idempotency_key: Optional[str] = None
 
+class EventBulkCreate(BaseModel):
+    items: List[EventCreate]
+
 class EventUpdate(BaseModel):
     id: str
     title: Optional[str] = None
     start: Optional[datetime] = None
     end: Optional[datetime] = None
     location: Optional[str] = None
-    attendees: Optional[List[EmailStr]] = None
+    attendees: Optional[List[Email]] = None
     description: Optional[str] = None
 
 class BusyBlock(BaseModel):
@@ -119,81 +235,296 @@ class EquipmentBody(BaseModel):
 class DirectoryPatch(BaseModel):
     value: dict  # shallow merge
 
-SQLModel.metadata.create_all(engine)
-
-def get_session():
-    with Session(engine) as s:
+def _migrate_attendees(conn) -> None:
+    """Move pre-JSON databases from the comma-joined attendees_csv column to attendees_json."""
+    columns = {c["name"] for c in inspect(conn).get_columns("event")}
+    if "attendees_json" in columns:
+        return
+    conn.execute(text("ALTER TABLE event ADD COLUMN attendees_json JSON"))
+    if "attendees_csv" not in columns:
+        return
+    rows = conn.execute(text("SELECT id, attendees_csv FROM event WHERE attendees_csv IS NOT NULL AND attendees_csv != ''"))
+    updates = [{"id": ev_id, "attendees": orjson.dumps(csv.split(",")).decode()} for ev_id, csv in rows]
+    if updates:
+        conn.execute(text("UPDATE event SET attendees_json = :attendees WHERE id = :id"), updates)
+
+def _rebuild_without_rowid(conn, table) -> bool:
+    """Copy a table created before it was declared WITHOUT ROWID into the new layout, once.
+
+    SQLite cannot convert a table in place. Columns the old table lacks take their defaults, and
+    app.py's own RETIRED_COLUMNS are left behind. Tables the api package shares in calendar.db are
+    skipped: they carry columns this model does not declare, or api tables hold foreign keys to them.
+    """
+    sql = conn.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": table.name}
+    ).scalar()
+    if sql is None or "WITHOUT ROWID" in sql.upper():
+        return False
+    inspector = inspect(conn)
+    foreign = {c["name"] for c in inspector.get_columns(table.name)} - set(table.columns.keys())
+    foreign -= RETIRED_COLUMNS
+    referenced_by = [
+        other for other in inspector.get_table_names()
+        if any(fk["referred_table"] == table.name for fk in inspector.get_foreign_keys(other))
+    ]
+    if foreign or referenced_by:
+        logger.warning(
+            "Keeping %s as a rowid table: the api package shares it (extra columns %s, referenced by %s)",
+            table.name, sorted(foreign), referenced_by,
+        )
+        return False
+    old = f"{table.name}_rowid"
+    conn.execute(text(f'ALTER TABLE "{table.name}" RENAME TO "{old}"'))
+    # Index names stay taken after the rename; drop them so table.create can rebuild them.
+    indexes = conn.execute(
+        text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :old AND sql IS NOT NULL"),
+        {"old": old},
+    ).scalars().all()
+    for name in indexes:
+        conn.execute(text(f'DROP INDEX "{name}"'))
+    table.create(conn)
+    old_columns = {c["name"] for c in inspect(conn).get_columns(old)}
+    columns = ", ".join(f'"{c.name}"' for c in table.columns if c.name in old_columns)
+    conn.execute(text(f'INSERT INTO "{table.name}" ({columns}) SELECT {columns} FROM "{old}"'))
+    conn.execute(text(f'DROP TABLE "{old}"'))
+    return True
+
+def _compact_memory_json(conn) -> None:
+    """Re-encode values written by the old json.dumps (", " / ": " separators) compactly."""
+    rows = conn.execute(text("SELECT key, value_json FROM memory")).all()
+    updates = []
+    for key, value_json in rows:
+        compact = orjson.dumps(orjson.loads(value_json)).decode()
+        if compact != value_json:
+            updates.append({"key": key, "value_json": compact})
+    if updates:
+        conn.execute(text("UPDATE memory SET value_json = :value_json WHERE key = :key"), updates)
+
+def _unique_idempotency_keys(conn) -> None:
+    """Replace a missing or non-unique ix_event_idempotency_key with the UNIQUE one, once."""
+    unique = {name: bool(flag) for _seq, name, flag, *_rest in conn.exec_driver_sql('PRAGMA index_list("event")')}
+    if unique.get("ix_event_idempotency_key", False):
+        return
+    # Retries that raced before the constraint existed: the first-inserted event (lowest rowid)
+    # keeps the key, as in api/database.py. event still has its rowid until the rebuild below.
+    conn.execute(text(
+        "UPDATE event SET idempotency_key = NULL WHERE idempotency_key IS NOT NULL AND rowid NOT IN "
+        "(SELECT min(rowid) FROM event WHERE idempotency_key IS NOT NULL GROUP BY idempotency_key)"
+    ))
+    conn.execute(text("DROP INDEX IF EXISTS ix_event_idempotency_key"))
+
+def _create_schema(conn) -> None:
+    SQLModel.metadata.create_all(conn)
+    _migrate_attendees(conn)
+    _unique_idempotency_keys(conn)
+    _rebuild_without_rowid(conn, Event.__table__)
+    if _rebuild_without_rowid(conn, Memory.__table__):
+        _compact_memory_json(conn)
+    # create_all skips existing tables; add indexes introduced after calendar.db was first created.
+    for index in Event.__table__.indexes:
+        index.create(conn, checkfirst=True)
+
+async def get_session():
+    # expire_on_commit=False: expired attributes cannot be lazily reloaded under asyncio.
+    async with AsyncSession(engine, expire_on_commit=False) as s:
         yield s
 
 # ---------------------- Helpers ----------------------
 def to_utc(dt: datetime) -> datetime:
     """Ensure dt is timezone-aware in UTC."""
-    if dt.tzinfo:
-        return dt.astimezone(TZ_UTC)
-    return LONDON.localize(dt).astimezone(TZ_UTC)
-
-def overlaps(a_start: datetime, a_end: datetime, b_start: datetime, b_end: datetime) -> bool:
-    return max(a_start, b_start) < min(a_end, b_end)
+    tz = dt.tzinfo
+    if tz is TZ_UTC:
+        return dt
+    if tz is None:
+        return dt.replace(tzinfo=LONDON).astimezone(TZ_UTC)
+    return dt.astimezone(TZ_UTC)
+
+def iso_datetime_query(name: str):
+    """Query dependency parsing an ISO 8601 datetime with ciso8601 instead of pydantic."""
+    def parse(raw: str = Query(..., alias=name, description="ISO 8601 datetime")) -> datetime:
+        try:
+            return ciso8601.parse_datetime(raw)
+        except ValueError:
+            raise HTTPException(400, f"Invalid {name}; use ISO 8601")
+    return parse
+
+def new_ulids(n: int) -> List[str]:
+    """n ULIDs sharing one millisecond timestamp, with all their randomness from one urandom call."""
+    ts = (time.time_ns() // 1_000_000).to_bytes(6, "big")
+    rand = os.urandom(10 * n)
+    return [str(ULID.from_bytes(ts + rand[i:i + 10])) for i in range(0, 10 * n, 10)]
+
+def _event_ref(ev: Event) -> OrjsonResponse:
+    # Returned as a response so orjson formats the datetimes instead of jsonable_encoder.
+    return OrjsonResponse({"id": ev.id, "start": ev.start, "end": ev.end})
+
+start_query = iso_datetime_query("start")
+end_query = iso_datetime_query("end")
+
+# Built once: the same SQL string on every call keeps hitting SQLAlchemy's compiled cache and
+# the connection's sqlite3 statement cache instead of re-parsing.
+BUSY_STMT = select(Event.start, Event.end).where(
+    Event.start < bindparam("range_end"), Event.end > bindparam("range_start")
+)
 
-def list_busy(session: Session, start: datetime, end: datetime) -> List[BusyBlock]:
-    rows = session.exec(select(Event).where(Event.start < end, Event.end > start)).all()
-    return [BusyBlock(start=e.start, end=e.end) for e in rows]
+async def list_busy(session: AsyncSession, start: datetime, end: datetime) -> List[Row]:
+    """(start, end) rows; callers read .start / .end, no BusyBlock is built per row."""
+    return (await session.exec(BUSY_STMT, params={"range_start": start, "range_end": end})).all()
+
+async def has_conflict(session: AsyncSession, start: datetime, end: datetime, exclude_id: Optional[str] = None) -> bool:
+    q = select(Event.id).where(Event.start < end, Event.end > start)
+    if exclude_id:
+        q = q.where(Event.id != exclude_id)
+    return (await session.exec(q.limit(1))).first() is not None
+
+EVENT_COLUMNS = (
+    Event.id,
+    Event.title,
+    Event.start,
+    Event.end,
+    Event.location,
+    Event.attendees_json.label("attendees"),
+    Event.description,
+    Event.idempotency_key,
+)
 
-def mem_get(session: Session, key: str):
-    row = session.get(Memory, key)
-    return json.loads(row.value_json) if row else None
+def _overlapping(columns, start: datetime, end: datetime):
+    return select(*columns).where(Event.start < end, Event.end > start).order_by(Event.start)
+
+async def _stream_rows(stmt):
+    """Yield stmt's rows as a JSON array of objects, LIST_BATCH_ROWS rows at a time.
+
+    Owns its session: the request-scoped one may be closed before the body is streamed.
+    """
+    stmt = stmt.execution_options(yield_per=LIST_BATCH_ROWS)
+    async with AsyncSession(engine) as session:
+        yield b"["
+        sep = b""
+        result = await session.stream(stmt)
+        async for batch in result.partitions():
+            yield sep + b",".join(orjson.dumps(row._asdict(), option=ORJSON_OPTIONS) for row in batch)
+            sep = b","
+        yield b"]"
+
+async def mem_get(session: AsyncSession, key: str):
+    row = await session.get(Memory, key)
+    return orjson.loads(row.value_json) if row else None
+
+# updated_at is set in SQL rather than relying on the column default, which databases created
+# before it existed do not have.
+_mem_upsert = sqlite_insert(Memory).values(updated_at=func.current_timestamp())
+MEM_UPSERT_STMT = _mem_upsert.on_conflict_do_update(
+    index_elements=[Memory.key],
+    set_={"value_json": _mem_upsert.excluded.value_json, "updated_at": func.current_timestamp()},
+)
 
-def mem_set(session: Session, key: str, value: dict):
-    row = session.get(Memory, key)
-    encoded = json.dumps(value)
-    if row:
-        row.value_json = encoded
-        row.updated_at = datetime.now(TZ_UTC)
-        session.add(row)
-    else:
-        session.add(Memory(key=key, value_json=encoded))
-    session.commit()
-
-def mem_list(session: Session, prefix: Optional[str] = None) -> List[str]:
+class MemoryWriter:
+    """Group commit for memory upserts.
+
+    Requests queue (key, encoded) and await a future; one task drains whatever arrived within
+    GROUP_COMMIT_WINDOW_SEC (up to GROUP_COMMIT_MAX) into a single executemany + COMMIT, so a
+    burst of writes pays for one WAL sync instead of one each. SQLite has a single writer anyway.
+    """
+
+    def __init__(self):
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def write(self, key: str, encoded: str):
+        done = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((key, encoded, done))
+        await done
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            await asyncio.sleep(GROUP_COMMIT_WINDOW_SEC)
+            while len(batch) < GROUP_COMMIT_MAX and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._commit(batch)
+            except Exception as exc:
+                for *_, done in batch:
+                    if not done.done():
+                        done.set_exception(exc)
+            else:
+                for *_, done in batch:
+                    if not done.done():
+                        done.set_result(None)
+
+    @staticmethod
+    async def _commit(batch):
+        latest = {key: encoded for key, encoded, _ in batch}  # later writes to a key win
+        params = [{"key": key, "value_json": encoded} for key, encoded in latest.items()]
+        async with AsyncSession(engine) as session:
+            await session.exec(MEM_UPSERT_STMT, params=params)
+            await session.commit()
+
+memory_writer = MemoryWriter()
+
+async def mem_set(key: str, value: dict):
+    await mem_set_raw(key, orjson.dumps(value).decode())
+
+async def mem_set_raw(key: str, encoded: str):
+    """mem_set for a value that is already JSON-encoded; goes through the group-commit writer."""
+    await memory_writer.write(key, encoded)
+
+async def mem_list(session: AsyncSession, prefix: Optional[str] = None) -> List[str]:
     q = select(Memory.key).order_by(Memory.key)
-    keys = [k for (k,) in session.exec(q)]
-    return [k for k in keys if (prefix is None or k.startswith(prefix))]
-
-def mem_delete(session: Session, key: str):
-    row = session.get(Memory, key)
+    if prefix:
+        # Range scan on the primary-key b-tree: every key starting with prefix sorts within
+        # [prefix, prefix + U+10FFFF). Case-sensitive, unlike LIKE.
+        q = q.where(Memory.key >= prefix, Memory.key < prefix + "\U0010ffff")
+    return (await session.exec(q)).all()
+
+async def mem_delete(session: AsyncSession, key: str):
+    row = await session.get(Memory, key)
     if row:
-        session.delete(row)
-        session.commit()
+        await session.delete(row)
+        await session.commit()
 
 # ---------------------- Health ----------------------
 @app.get("/health")
-def health():
+async def health():
     return {"ok": True}
 
 # ---------------------- Time ----------------------
 @app.get("/time.now")
-def time_now():
+async def time_now():
     now_utc = datetime.now(TZ_UTC)
     now_local = now_utc.astimezone(LONDON)
     off_min = int(now_local.utcoffset().total_seconds() // 60)
-    return {
-        "utc": now_utc.isoformat().replace("+00:00", "Z"),
+    # Returned as a response so orjson formats the datetimes (OPT_UTC_Z gives the "Z" suffix).
+    return OrjsonResponse({
+        "utc": now_utc,
         "tz": "Europe/London",
-        "local": now_local.isoformat(),
+        "local": now_local,
         "offset_minutes": off_min,
-    }
+    })
 
 # ---------------------- Calendar ----------------------
 @app.get("/availability.freebusy", response_model=FreeBusyResponse, dependencies=[Depends(require_bearer)])
-def freebusy(start: datetime = Query(...), end: datetime = Query(...), session: Session = Depends(get_session)):
+async def freebusy(start: datetime = Depends(start_query), end: datetime = Depends(end_query), session: AsyncSession = Depends(get_session)):
     start_utc, end_utc = to_utc(start), to_utc(end)
-    return FreeBusyResponse(busy=list_busy(session, start_utc, end_utc))
+    busy = await list_busy(session, start_utc, end_utc)
+    # Rows go straight to orjson; response_model stays for the OpenAPI schema.
+    return OrjsonResponse({"busy": [row._asdict() for row in busy]})
 
 @app.get("/events.list", dependencies=[Depends(require_bearer)])
-def events_list(
-    start: datetime = Query(...),
-    end: datetime = Query(...),
-    session: Session = Depends(get_session),
+async def events_list(
+    start: datetime = Depends(start_query),
+    end: datetime = Depends(end_query),
 ):
     start_utc, end_utc = to_utc(start), to_utc(end)
     if (end_utc - start_utc).total_seconds() > MAX_LIST_HOURS * 3600:
@@ -201,16 +532,11 @@ def events_list(
             413,
             detail=f"Range too large; use /events.summary_day or <= {MAX_LIST_HOURS} hours",
         )
-    rows = session.exec(
-        select(Event).where(Event.start < end_utc, Event.end > start_utc).order_by(Event.start)
-    ).all()
-    return [e.__dict__ for e in rows]
+    stmt = _overlapping(EVENT_COLUMNS, start_utc, end_utc)
+    return StreamingResponse(_stream_rows(stmt), media_type="application/json")
 
 @app.get("/events.summary_day", dependencies=[Depends(require_bearer)])
-def events_summary_day(
-    date: str = Query(..., description="YYYY-MM-DD"),
-    session: Session = Depends(get_session),
-):
+async def events_summary_day(date: str = Query(..., description="YYYY-MM-DD")):
     try:
         day = datetime.fromisoformat(date)
         if day.tzinfo is None:
@@ -220,153 +546,275 @@ def events_summary_day(
     start = day.replace(hour=0, minute=0, second=0, microsecond=0)
     end = start + timedelta(days=1)
 
-    rows = session.exec(
-        select(Event).where(Event.start < end, Event.end > start).order_by(Event.start)
-    ).all()
-    return [
-        {
-            "id": e.id,
-            "title": e.title,
-            "start": e.start.isoformat().replace("+00:00", "Z"),
-            "end": e.end.isoformat().replace("+00:00", "Z"),
-        }
-        for e in rows
-    ]
+    # A whole day can be hundreds of rows: stream them like /events.list instead of building a list.
+    stmt = _overlapping((Event.id, Event.title, Event.start, Event.end), start, end)
+    return StreamingResponse(_stream_rows(stmt), media_type="application/json")
+
+async def _event_for_key(session: AsyncSession, idempotency_key: str) -> Optional[Row]:
+    """(id, start, end) of the event holding idempotency_key: one seek on its unique index."""
+    return (await session.exec(
+        select(Event.id, Event.start, Event.end).where(Event.idempotency_key == idempotency_key)
+    )).first()
 
 @app.post("/events.create", dependencies=[Depends(require_bearer)])
-def events_create(payload: EventCreate, session: Session = Depends(get_session)):
+async def events_create(payload: EventCreate, session: AsyncSession = Depends(get_session)):
     start, end = to_utc(payload.start), to_utc(payload.end)
-    # idempotency
+    # idempotency: a retry must be answered before the conflict check, which its own event would fail
     if payload.idempotency_key:
-        existing = session.exec(
-            select(Event).where(Event.idempotency_key == payload.idempotency_key)
-        ).first()
+        existing = await _event_for_key(session, payload.idempotency_key)
         if existing:
-            return {
-                "id": existing.id,
-                "start": existing.start.isoformat().replace("+00:00", "Z"),
-                "end": existing.end.isoformat().replace("+00:00", "Z"),
-            }
-    # conflict check (small windows)
-    for b in list_busy(session, start, end):
-        if overlaps(start, end, b.start, b.end):
-            raise HTTPException(409, "Time conflict – choose another slot")
+            return _event_ref(existing)
+    if await has_conflict(session, start, end):
+        raise HTTPException(409, "Time conflict – choose another slot")
 
     ev = Event(
         title=payload.title,
         start=start,
         end=end,
         location=payload.location,
-        attendees_csv=",".join(payload.attendees) if payload.attendees else None,
+        attendees_json=payload.attendees or None,
         description=payload.description,
         idempotency_key=payload.idempotency_key,
     )
     session.add(ev)
-    session.commit()
-    session.refresh(ev)
-    return {
-        "id": ev.id,
-        "start": ev.start.isoformat().replace("+00:00", "Z"),
-        "end": ev.end.isoformat().replace("+00:00", "Z"),
-    }
+    try:
+        await session.commit()
+    except IntegrityError:
+        # A concurrent request with the same idempotency key committed first: answer with its event.
+        await session.rollback()
+        existing = await _event_for_key(session, payload.idempotency_key) if payload.idempotency_key else None
+        if not existing:
+            raise
+        return _event_ref(existing)
+    return _event_ref(ev)
+
+def _find_overlap(new: List[tuple], busy: List[Row]) -> Optional[int]:
+    """Sweep new (index, start, end) slots against each other and existing busy blocks.
+
+    Returns the index of a conflicting new slot, or None. Overlaps between two existing
+    events are not this batch's problem and are ignored.
+    """
+    slots = [(start, end, idx) for idx, start, end in new]
+    slots += [(b.start, b.end, None) for b in busy]
+    slots.sort(key=lambda slot: slot[0])
+    max_end_new = max_end_old = new_owner = None
+    for start, end, idx in slots:
+        if max_end_new is not None and max_end_new > start:
+            return idx if idx is not None else new_owner
+        if idx is not None:
+            if max_end_old is not None and max_end_old > start:
+                return idx
+            if max_end_new is None or end > max_end_new:
+                max_end_new, new_owner = end, idx
+        elif max_end_old is None or end > max_end_old:
+            max_end_old = end
+    return None
+
+@app.post("/events.create_bulk", dependencies=[Depends(require_bearer)])
+async def events_create_bulk(payload: EventBulkCreate, session: AsyncSession = Depends(get_session)):
+    """Create many events in one transaction; all-or-nothing on conflicts.
+
+    Idempotency keys are resolved with one IN (...) lookup per SQLITE_MAX_PARAMS keys, and
+    new rows go in through a single executemany INSERT.
+    """
+    keys = list({item.idempotency_key for item in payload.items if item.idempotency_key})
+    known = {}
+    for i in range(0, len(keys), SQLITE_MAX_PARAMS):
+        found = await session.exec(
+            select(Event.idempotency_key, Event.id, Event.start, Event.end)
+            .where(Event.idempotency_key.in_(keys[i:i + SQLITE_MAX_PARAMS]))
+        )
+        known.update({key: {"id": ev_id, "start": start, "end": end} for key, ev_id, start, end in found})
+
+    results: List[dict] = []
+    rows, slots = [], []
+    ids = iter(new_ulids(len(payload.items)))
+    for idx, item in enumerate(payload.items):
+        if item.idempotency_key in known:
+            results.append(known[item.idempotency_key])
+            continue
+        start, end = to_utc(item.start), to_utc(item.end)
+        row = {
+            "id": next(ids),
+            "title": item.title,
+            "start": start,
+            "end": end,
+            "location": item.location,
+            "attendees_json": item.attendees or None,
+            "description": item.description,
+            "idempotency_key": item.idempotency_key,
+        }
+        ref = {"id": row["id"], "start": start, "end": end}
+        if item.idempotency_key:
+            known[item.idempotency_key] = ref  # later repeats in this batch resolve to this row
+        rows.append(row)
+        slots.append((idx, start, end))
+        results.append(ref)
+
+    if rows:
+        busy = await list_busy(
+            session, min(start for _, start, _ in slots), max(end for _, _, end in slots)
+        )
+        conflict = _find_overlap(slots, busy)
+        if conflict is not None:
+            raise HTTPException(409, f"Time conflict at items[{conflict}] – choose another slot")
+        try:
+            await session.exec(Event.__table__.insert(), params=rows)
+            await session.commit()
+        except IntegrityError:
+            # Another request claimed one of these idempotency keys meanwhile; a retry resolves it.
+            await session.rollback()
+            raise HTTPException(409, "Idempotency key used concurrently – retry the batch")
+    # Returned directly so orjson writes the datetimes (with "Z") instead of jsonable_encoder.
+    return OrjsonResponse({"events": results})
 
 @app.post("/events.update", dependencies=[Depends(require_bearer)])
-def events_update(payload: EventUpdate, session: Session = Depends(get_session)):
-    ev = session.get(Event, payload.id)
+async def events_update(payload: EventUpdate, session: AsyncSession = Depends(get_session)):
+    ev = await session.get(Event, payload.id)
     if not ev:
         raise HTTPException(404, "Event not found")
 
     new_start = to_utc(payload.start) if payload.start else ev.start
     new_end = to_utc(payload.end) if payload.end else ev.end
-    for b in list_busy(session, new_start, new_end):
-        if b.start == ev.start and b.end == ev.end:
-            continue
-        if overlaps(new_start, new_end, b.start, b.end):
-            raise HTTPException(409, "Time conflict – choose another slot")
+    if await has_conflict(session, new_start, new_end, exclude_id=ev.id):
+        raise HTTPException(409, "Time conflict – choose another slot")
 
     ev.title = payload.title or ev.title
     ev.start, ev.end = new_start, new_end
     ev.location = payload.location or ev.location
-    ev.attendees_csv = (
-        ",".join(payload.attendees) if payload.attendees is not None else ev.attendees_csv
-    )
+    if payload.attendees is not None:
+        ev.attendees_json = payload.attendees
     ev.description = payload.description or ev.description
     session.add(ev)
-    session.commit()
-    session.refresh(ev)
-    return {
-        "id": ev.id,
-        "start": ev.start.isoformat().replace("+00:00", "Z"),
-        "end": ev.end.isoformat().replace("+00:00", "Z"),
-    }
+    await session.commit()
+    await session.refresh(ev)
+    return _event_ref(ev)
 
 @app.post("/events.delete", dependencies=[Depends(require_bearer)])
-def events_delete(data: dict, session: Session = Depends(get_session)):
+async def events_delete(data: dict, session: AsyncSession = Depends(get_session)):
     ev_id = data.get("id")
     if not ev_id:
         raise HTTPException(400, "id required")
-    ev = session.get(Event, ev_id)
+    ev = await session.get(Event, ev_id)
     if ev:
-        session.delete(ev)
-        session.commit()
+        await session.delete(ev)
+        await session.commit()
     return {"status": "ok"}
 
 # ---------------------- Memory ----------------------
 @app.post("/memory.set", dependencies=[Depends(require_bearer)])
-def memory_set(payload: MemorySet, session: Session = Depends(get_session)):
-    mem_set(session, payload.key, payload.value)
+async def memory_set(payload: MemorySet):
+    await mem_set(payload.key, payload.value)
+    _body_cache.pop(payload.key, None)
     return {"status": "ok", "key": payload.key}
 
 @app.get("/memory.get", dependencies=[Depends(require_bearer)])
-def memory_get(key: str = Query(...), session: Session = Depends(get_session)):
-    val = mem_get(session, key)
+async def memory_get(key: str = Query(...), session: AsyncSession = Depends(get_session)):
+    val = await mem_get(session, key)
     if val is None:
         raise HTTPException(404, "Not found")
     return {"key": key, "value": val}
 
 @app.get("/memory.list", dependencies=[Depends(require_bearer)])
-def memory_keys(prefix: Optional[str] = Query(None), session: Session = Depends(get_session)):
-    return {"keys": mem_list(session, prefix)}
+async def memory_keys(prefix: Optional[str] = Query(None), session: AsyncSession = Depends(get_session)):
+    return {"keys": await mem_list(session, prefix)}
 
 @app.post("/memory.delete", dependencies=[Depends(require_bearer)])
-def memory_del(payload: MemorySet, session: Session = Depends(get_session)):
-    mem_delete(session, payload.key)
+async def memory_del(payload: MemorySet, session: AsyncSession = Depends(get_session)):
+    await mem_delete(session, payload.key)
+    _body_cache.pop(payload.key, None)
     return {"status": "ok"}
 
+# ---------------------- Cached reads ----------------------
+BODY_CACHE_TTL_SEC = 300.0
+
+# Rendered /directory.get and /equipment.get_list bodies: memory key -> (expires_at, body, etag).
+# Every write path in this process drops the key; the TTL bounds staleness across workers.
+_body_cache: Dict[str, Tuple[float, bytes, str]] = {}
+
+def _cached_body(key: str) -> Optional[Tuple[float, bytes, str]]:
+    hit = _body_cache.get(key)
+    return hit if hit is not None and hit[0] > time.monotonic() else None
+
+def _cache_body(key: str, body: bytes) -> Tuple[float, bytes, str]:
+    etag = f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+    entry = _body_cache[key] = (time.monotonic() + BODY_CACHE_TTL_SEC, body, etag)
+    return entry
+
+def _etag_response(entry: Tuple[float, bytes, str], if_none_match: Optional[str]) -> Response:
+    _, body, etag = entry
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
 # ---------------------- Equipment ----------------------
+EQUIPMENT_KEY = "equipment/kitchen.json"
+
 @app.post("/equipment.set_list", dependencies=[Depends(require_bearer)])
-def equipment_set_list(body: EquipmentBody, session: Session = Depends(get_session)):
-    mem_set(session, "equipment/kitchen.json", {"items": body.items})
+async def equipment_set_list(body: EquipmentBody):
+    await mem_set(EQUIPMENT_KEY, {"items": body.items})
+    _body_cache.pop(EQUIPMENT_KEY, None)
     return {"status": "ok"}
 
 @app.get("/equipment.get_list", dependencies=[Depends(require_bearer)])
-def equipment_get_list(session: Session = Depends(get_session)):
-    return mem_get(session, "equipment/kitchen.json") or {"items": []}
+async def equipment_get_list(
+    if_none_match: Optional[str] = Header(None), session: AsyncSession = Depends(get_session)
+):
+    entry = _cached_body(EQUIPMENT_KEY)
+    if entry is None:
+        val = await mem_get(session, EQUIPMENT_KEY) or {"items": []}
+        entry = _cache_body(EQUIPMENT_KEY, orjson.dumps(val, option=ORJSON_OPTIONS))
+    return _etag_response(entry, if_none_match)
 
 # ---------------------- Directory ----------------------
-DEFAULT_DIRECTORY = {
+DIRECTORY_KEY = "registry/directory.json"
+# Read-only view; encoded once below so a cold /directory.get writes and returns ready-made JSON.
+DEFAULT_DIRECTORY = MappingProxyType({
     "_v": 1,
     "calendar": {"create": "/events.create", "list": "/events.list"},
     "equipment": {"set": "/equipment.set_list", "get": "/equipment.get_list"},
     "memory": {"set": "/memory.set", "get": "/memory.get", "list": "/memory.list"},
-}
+})
+DEFAULT_DIRECTORY_JSON = orjson.dumps(dict(DEFAULT_DIRECTORY)).decode()
+DEFAULT_DIRECTORY_BODY = orjson.dumps({"key": DIRECTORY_KEY, "value": dict(DEFAULT_DIRECTORY)})
 
 @app.get("/directory.get", dependencies=[Depends(require_bearer)])
-def directory_get(session: Session = Depends(get_session)):
-    val = mem_get(session, "registry/directory.json")
-    if not val:
-        mem_set(session, "registry/directory.json", DEFAULT_DIRECTORY)
-        val = DEFAULT_DIRECTORY
-    return {"key": "registry/directory.json", "value": val}
+async def directory_get(
+    if_none_match: Optional[str] = Header(None), session: AsyncSession = Depends(get_session)
+):
+    entry = _cached_body(DIRECTORY_KEY)
+    if entry is None:
+        val = await mem_get(session, DIRECTORY_KEY)
+        if not val:
+            await session.close()  # hand the connection back before waiting on the memory writer
+            await mem_set_raw(DIRECTORY_KEY, DEFAULT_DIRECTORY_JSON)
+            body = DEFAULT_DIRECTORY_BODY
+        else:
+            body = orjson.dumps({"key": DIRECTORY_KEY, "value": val}, option=ORJSON_OPTIONS)
+        entry = _cache_body(DIRECTORY_KEY, body)
+    return _etag_response(entry, if_none_match)
 
 @app.post("/directory.patch", dependencies=[Depends(require_bearer)])
-def directory_patch(payload: DirectoryPatch, session: Session = Depends(get_session)):
-    cur = mem_get(session, "registry/directory.json") or DEFAULT_DIRECTORY
+async def directory_patch(payload: DirectoryPatch, session: AsyncSession = Depends(get_session)):
+    cur = await mem_get(session, DIRECTORY_KEY) or DEFAULT_DIRECTORY
+    # The memory writer needs a pooled connection of its own: release this one before waiting on it.
+    await session.close()
     new_val = {**cur, **payload.value}
-    mem_set(session, "registry/directory.json", new_val)
+    await mem_set(DIRECTORY_KEY, new_val)
+    _body_cache.pop(DIRECTORY_KEY, None)
     return {"status": "ok", "value": new_val}
 
 # ---------------------- Run (local) ----------------------
 if __name__ == "__main__":
+    import sys
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=int(os.getenv("PORT", 8080)))
+    # Single process; for several workers use `uvicorn app:app --workers N` (spawned workers
+    # would re-import this file as __mp_main__ and register the tables twice).
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", 8080)),
+        loop="asyncio" if sys.platform == "win32" else "uvloop",  # uvloop has no Windows build
+        http="httptools",
+        limit_concurrency=int(os.getenv("UVICORN_CONCURRENCY", "512")),
+    )
@@ -33,8 +33,8 @@ def main() -> None:
     end = now + dt.timedelta(days=args.days)
 
     print(f"Window: {now.isoformat()} to {end.isoformat()}")
-    for name, cal_id in CALENDAR_IDS.items():
-        events = gcal_client.list_events(calendar_id=cal_id, time_min=now, time_max=end, max_results=200)
+    results = gcal_client.list_events_many(list(CALENDAR_IDS.values()), time_min=now, time_max=end, max_results=200)
+    for (name, cal_id), events in zip(CALENDAR_IDS.items(), results):
         if not events:
             continue
         print(f"\n=== {name} ({cal_id}) ===")
@@ -11,6 +11,7 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import functools
 import json
 from pathlib import Path
 from typing import Dict, List, Tuple
@@ -22,22 +23,28 @@ import gcal_client
 CONFIG_PATH = Path("schedule_config.json")
 
 
+@functools.lru_cache(maxsize=64)
 def iso_week_start(iso_week: str) -> dt.date:
     year, week = iso_week.split("-W")
     return dt.datetime.strptime(f"{year} {int(week)} 1", "%G %V %u").date()
 
 
-def load_config(path: Path) -> dict:
-    with path.open("r", encoding="utf-8") as fh:
+@functools.lru_cache(maxsize=1)
+def _load_config_cached(path: str, _mtime_ns: int) -> dict:
+    with open(path, "r", encoding="utf-8") as fh:
         return json.load(fh)
 
 
+def load_config(path: Path) -> dict:
+    """Parsed config, re-read only when the file's mtime changes. Treat the result as read-only."""
+    return _load_config_cached(str(path.resolve()), path.stat().st_mtime_ns)
+
+
 def list_events(cal_ids: Dict[str, str], start: dt.datetime, end: dt.datetime) -> List[Tuple[str, dict]]:
+    found = gcal_client.list_events_many(list(cal_ids.values()), time_min=start, time_max=end, max_results=400)
     rows: List[Tuple[str, dict]] = []
-    for name, cal_id in cal_ids.items():
-        events = gcal_client.list_events(calendar_id=cal_id, time_min=start, time_max=end, max_results=400)
-        for ev in events:
-            rows.append((name, ev))
+    for name, events in zip(cal_ids, found):
+        rows.extend((name, ev) for ev in events)
     return rows
 
 
@@ -62,21 +69,21 @@ def main() -> None:
     cal_ids = cfg["calendar_map"]
     events = list_events(cal_ids, window_start, window_end)
 
-    # Sort by start time
+    # Sort by start time; each start string is pulled out once and reused when printing.
     def start_dt(ev: dict) -> str:
-        return ev.get("start", {}).get("dateTime") or ev.get("start", {}).get("date") or ""
+        start = ev.get("start", {})
+        return start.get("dateTime") or start.get("date") or ""
 
-    events.sort(key=lambda x: start_dt(x[1]))
+    keyed = sorted(((start_dt(ev), cal_name, ev) for cal_name, ev in events), key=lambda item: item[0])
 
     print(f"Week: {week_start} to {week_start + dt.timedelta(days=6)} ({window_start.isoformat()} to {window_end.isoformat()})")
     print(f"Timezone: {cfg.get('timezone', 'UTC')}")
     print(f"Calendars: {', '.join(cal_ids.keys())}")
     print("\nBusy items:")
-    if not events:
+    if not keyed:
         print("  None")
         return
-    for cal_name, ev in events:
-        start = ev.get("start", {}).get("dateTime") or ev.get("start", {}).get("date")
+    for start, cal_name, ev in keyed:
         end = ev.get("end", {}).get("dateTime") or ev.get("end", {}).get("date")
         summary = ev.get("summary") or "(no title)"
         desc = ev.get("description") or ""
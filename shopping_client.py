@@ -5,14 +5,16 @@ Usage:
   python shopping_client.py shopping_example.json
 """
 
+import functools
 import json
 import sys
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from googleapiclient.discovery import build
 from google.oauth2.credentials import Credentials
 
 SCOPES = ["https://www.googleapis.com/auth/tasks"]
+BATCH_LIMIT = 50  # Tasks API maximum calls per batch request
 
 
 def load_shopping(path: str) -> Dict[str, Any]:
@@ -20,9 +22,11 @@ def load_shopping(path: str) -> Dict[str, Any]:
         return json.load(fh)
 
 
+@functools.lru_cache(maxsize=1)
 def tasks_service():
+    """Tasks API client, built once per process."""
     creds = Credentials.from_authorized_user_file("token.json", SCOPES)
-    return build("tasks", "v1", credentials=creds)
+    return build("tasks", "v1", credentials=creds, cache_discovery=False)
 
 
 def ensure_tasklist(service, title: str) -> str:
@@ -64,14 +68,33 @@ def build_notes(item: Dict[str, Any]) -> str:
 
 
 def create_tasks(service, tasklist_id: str, items: List[Dict[str, Any]]) -> None:
-    for item in items:
-        service.tasks().insert(
-            tasklist=tasklist_id,
-            body={
-                "title": build_title(item),
-                "notes": build_notes(item) or None,
-            },
-        ).execute()
+    """
+    Insert one task per item, BATCH_LIMIT per HTTP request instead of one request each.
+    Stops after the first batch containing a failure and raises that item's error.
+    The calls in a batch may run in any order, so the list order is not preserved; chaining
+    ``previous=`` would need each task's id first and so one request per item.
+    """
+    errors: List[Exception] = []
+
+    def on_response(_request_id: str, _response: Dict[str, Any], exception: Optional[Exception]) -> None:
+        if exception is not None:
+            errors.append(exception)
+
+    for offset in range(0, len(items), BATCH_LIMIT):
+        batch = service.new_batch_http_request(callback=on_response)
+        for item in items[offset:offset + BATCH_LIMIT]:
+            batch.add(
+                service.tasks().insert(
+                    tasklist=tasklist_id,
+                    body={
+                        "title": build_title(item),
+                        "notes": build_notes(item) or None,
+                    },
+                )
+            )
+        batch.execute()
+        if errors:
+            raise errors[0]
 
 
 def main():
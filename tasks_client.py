@@ -8,7 +8,9 @@ Token from auth_gcal.py must include that scope.
 from __future__ import annotations
 
 import datetime as dt
-from typing import Any, Dict, List, Optional
+import functools
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 from googleapiclient.discovery import build
 from google.oauth2.credentials import Credentials
@@ -16,11 +18,32 @@ from google.oauth2.credentials import Credentials
 import gcal_client
 
 TASKS_SCOPE = ["https://www.googleapis.com/auth/tasks"]
+TZ_UTC = dt.timezone.utc
+TASKLIST_CACHE_TTL_SEC = 300.0
 
+# title -> (expires_at, tasklist id); spares repeat ensure_tasklist calls the list round-trip.
+_tasklist_ids: Dict[str, Tuple[float, str]] = {}
 
+
+def _to_rfc3339_z(value: dt.datetime) -> str:
+    """UTC RFC 3339 with a "Z" suffix, formatted directly rather than isoformat() + replace()."""
+    if value.tzinfo is not TZ_UTC:
+        value = value.astimezone(TZ_UTC)
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+@functools.lru_cache(maxsize=1)
 def _service() -> Any:
+    """Tasks API client, built once per process (token.json read + client construction)."""
     creds = Credentials.from_authorized_user_file("token.json", TASKS_SCOPE)
-    return build("tasks", "v1", credentials=creds)
+    # Discovery doc ships with the library; skip the file cache and its oauth2client warning.
+    return build("tasks", "v1", credentials=creds, cache_discovery=False)
+
+
+def reset_service() -> None:
+    """Forget the cached client, e.g. after token.json was re-issued or a refresh failed."""
+    _service.cache_clear()
+    _tasklist_ids.clear()
 
 
 def list_tasklists() -> List[Dict[str, Any]]:
@@ -29,12 +52,17 @@ def list_tasklists() -> List[Dict[str, Any]]:
 
 
 def ensure_tasklist(title: str) -> str:
-    svc = _service()
-    existing = [tl for tl in list_tasklists() if tl.get("title") == title]
-    if existing:
-        return existing[0]["id"]
-    created = svc.tasklists().insert(body={"title": title}).execute()
-    return created["id"]
+    hit = _tasklist_ids.get(title)
+    if hit is not None and hit[0] > time.monotonic():
+        return hit[1]
+    for tl in list_tasklists():
+        if tl.get("title") == title:
+            tasklist_id = tl["id"]
+            break
+    else:
+        tasklist_id = _service().tasklists().insert(body={"title": title}).execute()["id"]
+    _tasklist_ids[title] = (time.monotonic() + TASKLIST_CACHE_TTL_SEC, tasklist_id)
+    return tasklist_id
 
 
 def list_tasks(tasklist_id: str, show_completed: bool = False) -> List[Dict[str, Any]]:
@@ -61,7 +89,7 @@ def add_task(
     if notes:
         body["notes"] = notes
     if due:
-        body["due"] = due.astimezone(dt.timezone.utc).isoformat().replace("+00:00", "Z")
+        body["due"] = _to_rfc3339_z(due)
     return svc.tasks().insert(tasklist=tasklist_id, body=body).execute()
 
 